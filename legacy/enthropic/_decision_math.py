@@ -0,0 +1,97 @@
+"""
+Calculs de confiance du moteur de décision.
+
+Ce module ne contient que des fonctions pures typées sur des valeurs
+primitives, afin de pouvoir être compilé tel quel (mypyc) ; la version
+Python reste utilisée lorsqu'aucune extension compilée n'est présente.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+
+# Poids des facteurs de confiance : intention, contexte, heure, préférences, énergie, confidentialité
+FACTOR_WEIGHTS: Tuple[float, ...] = (0.3, 0.2, 0.15, 0.2, 0.1, 0.05)
+
+# Certaines décisions sont plus appropriées à certains moments
+TIME_FACTORS: Dict[str, float] = {
+    "morning": 0.8,
+    "afternoon": 0.9,
+    "evening": 0.7,
+    "night": 0.5
+}
+
+# Actions d'extinction, plus efficaces énergétiquement
+ENERGY_SAVING_ACTIONS: FrozenSet[str] = frozenset({"éteins", "désactive"})
+
+
+def _context_factor_for_mask(mask: int) -> float:
+    """
+    Calcule le facteur de contexte pour un masque de champs renseignés.
+    
+    Args:
+        mask: bit 0 localisation, bit 1 météo, bit 2 états des devices, bit 3 préférences
+    
+    Returns:
+        Facteur de contexte
+    """
+    factor = 0.5
+    for bit, bonus in ((0, 0.1), (1, 0.1), (2, 0.2), (3, 0.1)):
+        if mask >> bit & 1:
+            factor += bonus
+    return min(1.0, factor)
+
+
+# Facteur de contexte précalculé pour les 16 combinaisons de champs renseignés
+# (mémoïsation exhaustive : aucun cache supplémentaire n'est nécessaire)
+CONTEXT_FACTORS: Tuple[float, ...] = tuple(_context_factor_for_mask(mask) for mask in range(16))
+
+
+def context_factor(has_location: bool, has_weather: bool, has_devices: bool, has_preferences: bool) -> float:
+    """Plus le contexte est riche, plus le facteur est élevé."""
+    return CONTEXT_FACTORS[has_location | has_weather << 1 | has_devices << 2 | has_preferences << 3]
+
+
+@lru_cache(maxsize=32)
+def time_factor(time_of_day: Optional[str]) -> float:
+    """Facteur temporel d'un moment de la journée (0.5 si inconnu)."""
+    if not time_of_day:
+        return 0.5
+    return TIME_FACTORS.get(time_of_day, 0.5)
+
+
+def preference_factor(auto_optimization: bool) -> float:
+    """Facteur de préférences : l'optimisation automatique favorise la décision."""
+    return 0.9 if auto_optimization else 0.5
+
+
+def energy_factor(is_control: bool, actions: Iterable[str]) -> float:
+    """Facteur d'énergie : les actions d'extinction sont plus efficaces."""
+    if is_control and any(action in ENERGY_SAVING_ACTIONS for action in actions):
+        return 0.9
+    return 0.5
+
+
+def privacy_factor(is_query: bool) -> float:
+    """Facteur de confidentialité : les requêtes sont moins sensibles que les contrôles."""
+    return 0.8 if is_query else 0.5
+
+
+@lru_cache(maxsize=256)
+def weighted_confidence(rule_confidence: float, factor_values: Tuple[float, ...]) -> float:
+    """
+    Combine les facteurs pondérés et normalise la confiance.
+    
+    Mémorisée : les mêmes profils (règle, contexte, heure) reviennent d'une décision à l'autre.
+    
+    Args:
+        rule_confidence: Confiance propre de la règle
+        factor_values: Valeurs des facteurs, dans l'ordre de FACTOR_WEIGHTS
+    
+    Returns:
+        Niveau de confiance borné à [0.1, 1.0]
+    """
+    score = 0.0
+    for weight, value in zip(FACTOR_WEIGHTS, factor_values):
+        score += weight * value
+    return max(0.1, min(1.0, rule_confidence * score))
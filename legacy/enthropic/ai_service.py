@@ -5,16 +5,73 @@ Ce service utilise des modèles d'IA pour comprendre les intentions,
 analyser le contexte et prendre des décisions intelligentes.
 """
 
+import asyncio
 import json
 import os
+import re
 import logging
-from typing import Dict, Any, Optional, List
+import importlib.util
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Callable, Hashable
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur json
+    orjson = None
+
+
+# HTTP/2 nécessite l'extra httpx[http2] (paquet h2)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Mots-clés de l'analyse d'intention de fallback, compilés une seule fois
+_FALLBACK_CONTROL_RE = re.compile("allume|éteins|active|désactive", re.IGNORECASE)
+_FALLBACK_QUERY_RE = re.compile("combien|quelle|quel|état", re.IGNORECASE)
+_FALLBACK_SCENE_RE = re.compile("scène|mode|ambiance", re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def _classify_fallback_intent(text: str) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """
+    Classe un texte par mots-clés pour l'analyse d'intention de fallback.
+    
+    Args:
+        text: Texte normalisé (casefold)
+        
+    Returns:
+        Tuple (type d'intention, entités sous forme de paires clé/valeur)
+    """
+    if _FALLBACK_CONTROL_RE.search(text):
+        return "control", (("action", "toggle"),)
+    if _FALLBACK_QUERY_RE.search(text):
+        return "query", (("query_type", "status"),)
+    if _FALLBACK_SCENE_RE.search(text):
+        return "scene", (("scene_type", "ambiance"),)
+    return "control", ()
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Sérialise un payload d'API en une seule passe (orjson si disponible)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _decode_response(response: httpx.Response) -> Dict[str, Any]:
+    """Décode le corps JSON d'une réponse d'API directement depuis ses octets."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class IntentType(Enum):
     """Types d'intentions supportées."""
@@ -26,7 +83,12 @@ class IntentType(Enum):
     DIAGNOSTIC = "diagnostic"
 
 
-@dataclass
+# Table valeur -> membre, évite la machinerie d'Enum.__call__ par réponse d'API
+_INTENT_BY_VALUE: Dict[str, IntentType] = {intent_type.value: intent_type for intent_type in IntentType}
+_DEFAULT_INTENT_TYPE = IntentType.CONTROL
+
+
+@dataclass(slots=True)
 class Intent:
     """Représente une intention utilisateur."""
     type: IntentType
@@ -40,17 +102,17 @@ class Intent:
             self.timestamp = datetime.now()
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit en dictionnaire."""
-        data = asdict(self)
-        data['type'] = self.type.value
-        if self.timestamp:
-            data['timestamp'] = self.timestamp.isoformat()
-        else:
-            data['timestamp'] = datetime.now().isoformat()
-        return data
+        """Convertit en dictionnaire (sans copie profonde des champs)."""
+        return {
+            'type': self.type.value,
+            'text': self.text,
+            'confidence': self.confidence,
+            'entities': self.entities,
+            'timestamp': (self.timestamp or datetime.now()).isoformat()
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     """Représente le contexte d'une interaction."""
     user_id: Optional[str] = None
@@ -73,16 +135,20 @@ class Context:
             self.recent_actions = []
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit en dictionnaire."""
-        data = asdict(self)
-        if self.timestamp:
-            data['timestamp'] = self.timestamp.isoformat()
-        else:
-            data['timestamp'] = datetime.now().isoformat()
-        return data
+        """Convertit en dictionnaire (sans copie profonde des champs)."""
+        return {
+            'user_id': self.user_id,
+            'location': self.location,
+            'time_of_day': self.time_of_day,
+            'weather': self.weather,
+            'device_states': self.device_states,
+            'user_preferences': self.user_preferences,
+            'recent_actions': self.recent_actions,
+            'timestamp': (self.timestamp or datetime.now()).isoformat()
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Decision:
     """Représente une décision prise par l'IA."""
     action: str
@@ -100,37 +166,110 @@ class Decision:
             self.alternatives = []
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit en dictionnaire."""
-        data = asdict(self)
-        if self.timestamp:
-            data['timestamp'] = self.timestamp.isoformat()
-        else:
-            data['timestamp'] = datetime.now().isoformat()
-        return data
+        """Convertit en dictionnaire (sans copie profonde des champs)."""
+        return {
+            'action': self.action,
+            'target': self.target,
+            'parameters': self.parameters,
+            'confidence': self.confidence,
+            'reasoning': self.reasoning,
+            'alternatives': self.alternatives,
+            'timestamp': (self.timestamp or datetime.now()).isoformat()
+        }
 
 
 class AIService:
     """Service IA principal."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: str = os.getenv('ENTHROPIC_BASE_URL', 'http://localhost:8000')):
+    # Commandes de device indépendantes des paramètres de la décision
+    _STATIC_COMMANDS: Dict[str, Dict[str, Any]] = {
+        "turn_on": {"on": True},
+        "turn_off": {"on": False},
+        "query_status": {"query": "status"}
+    }
+    
+    # Commandes construites à partir des paramètres de la décision
+    _DYNAMIC_COMMANDS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+        "set_brightness": lambda p: {"bri": p.get("brightness", 100)},
+        "set_color": lambda p: {"hue": p.get("hue", 0), "sat": p.get("saturation", 100)}
+    }
+    
+    # Disjoncteur : N échecs consécutifs dans la fenêtre ouvrent le circuit pendant le délai
+    _BREAKER_FAILURE_THRESHOLD = 5
+    _BREAKER_WINDOW = 10.0
+    _BREAKER_COOLDOWN = 30.0
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = os.getenv('ENTHROPIC_BASE_URL', 'http://localhost:8000'),
+        http_client: Optional[httpx.AsyncClient] = None,
+        intent_cache_size: int = 1024,
+        context_cache_size: int = 128,
+        context_cache_ttl: float = 60.0,
+        max_concurrency: int = 32
+    ):
         """
         Initialise le service IA.
         
         Args:
             api_key: Clé API pour les services externes
             base_url: URL de base pour les API IA
+            http_client: Client HTTP partagé (optionnel, non fermé par close())
+            intent_cache_size: Nombre maximal d'intentions en cache (LRU)
+            context_cache_size: Nombre maximal de contextes en cache (LRU)
+            context_cache_ttl: Durée de validité d'un contexte en cache (secondes)
+            max_concurrency: Nombre maximal d'appels d'API simultanés par lot
         """
         self.api_key = api_key
         self.base_url = base_url
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self._intent_url = f"{base_url}/api/intent"
+        self._decision_url = f"{base_url}/api/decision"
+        self._owns_http_client = http_client is None
+        self._max_concurrency = max_concurrency
+        # En-têtes construits une seule fois (autorisation + type de contenu)
+        self._request_headers = (
+            {**_JSON_HEADERS, "Authorization": f"Bearer {api_key}"} if api_key else dict(_JSON_HEADERS)
+        )
+        # Un client interne porte déjà ces en-têtes ; un client partagé les reçoit par requête
+        self._call_headers = None if self._owns_http_client else self._request_headers
+        self.http_client = http_client or httpx.AsyncClient(
+            headers=self._request_headers,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(30.0, connect=3.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=max_concurrency,
+                max_connections=max_concurrency * 2,
+                keepalive_expiry=60.0
+            )
+        )
         self.logger = logging.getLogger(__name__)
         
-        # Cache pour les résultats
-        self._intent_cache: Dict[str, Intent] = {}
-        self._context_cache: Dict[str, Context] = {}
+        # Cache LRU pour les résultats
+        self.intent_cache_size = intent_cache_size
+        self.context_cache_size = context_cache_size
+        self.context_cache_ttl = context_cache_ttl
+        self._intent_cache: "OrderedDict[str, Intent]" = OrderedDict()
+        # Contextes : clé -> (contexte, expiration monotone)
+        self._context_cache: "OrderedDict[Optional[str], Tuple[Context, float]]" = OrderedDict()
+        # Verrous par clé : une seule requête en vol par intention/contexte
+        self._intent_locks: Dict[str, asyncio.Lock] = {}
+        self._context_locks: Dict[Optional[str], asyncio.Lock] = {}
+        # Compatibilité des device managers, mémorisée par type
+        self._device_manager_support: Dict[type, bool] = {}
+        # État du disjoncteur des API distantes (horloge monotone)
+        self._breaker_failures = 0
+        self._breaker_first_failure = 0.0
+        self._breaker_open_until = 0.0
         
         self.logger.info("AIService initialisé")
     
+    async def __aenter__(self) -> "AIService":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
     async def analyze_intent(self, text: str, user_id: Optional[str] = None) -> Intent:
         """
         Analyse l'intention d'un texte utilisateur.
@@ -143,100 +282,154 @@ class AIService:
             Intention détectée
         """
         cache_key = f"{user_id}:{text}"
-        if cache_key in self._intent_cache:
-            return self._intent_cache[cache_key]
+        cached_intent = self._cache_get(self._intent_cache, cache_key)
+        if cached_intent is not None:
+            return cached_intent
+        
+        # Double vérification sous verrou : les doublons concurrents attendent le premier appel
+        lock = self._intent_locks.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                cached_intent = self._cache_get(self._intent_cache, cache_key)
+                if cached_intent is not None:
+                    return cached_intent
+                return await self._analyze_intent_uncached(text, user_id, cache_key)
+        finally:
+            if self._intent_locks.get(cache_key) is lock and not lock.locked():
+                del self._intent_locks[cache_key]
+    
+    async def _analyze_intent_uncached(
+        self,
+        text: str,
+        user_id: Optional[str],
+        cache_key: str
+    ) -> Intent:
+        """
+        Analyse une intention absente du cache et met le résultat en cache.
         
+        Args:
+            text: Texte à analyser
+            user_id: ID de l'utilisateur
+            cache_key: Clé de cache de l'intention
+            
+        Returns:
+            Intention détectée
+        """
+        now = datetime.now()
+        now_iso = now.isoformat()
         try:
             # Appel à l'API IA
-            response = await self._call_intent_api(text, user_id)
+            response = await self._call_intent_api(text, user_id, now_iso)
             
             # Création de l'intention
+            timestamp = response.get("timestamp")
             intent = Intent(
-                type=IntentType(response.get("type", "control")),
+                type=_INTENT_BY_VALUE.get(response.get("type"), _DEFAULT_INTENT_TYPE),
                 text=text,
                 confidence=response.get("confidence", 0.5),
                 entities=response.get("entities", {}),
-                timestamp=datetime.fromisoformat(response.get("timestamp", datetime.now().isoformat()))
+                timestamp=self._parse_timestamp(timestamp, now, now_iso)
             )
             
             # Mise en cache
-            self._intent_cache[cache_key] = intent
+            self._cache_put(self._intent_cache, cache_key, intent, self.intent_cache_size)
             
-            self.logger.info(f"Intention analysée: {intent.type.value} (confiance: {intent.confidence})")
+            self.logger.info("Intention analysée: %s (confiance: %s)", intent.type.value, intent.confidence)
             return intent
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'analyse d'intention: {e}")
+            self.logger.error("Erreur lors de l'analyse d'intention: %s", e)
             # Retour d'une intention par défaut
             return Intent(
                 type=IntentType.CONTROL,
                 text=text,
                 confidence=0.1,
-                entities={"error": str(e)}
+                entities={"error": str(e)},
+                timestamp=now
             )
     
-    async def _call_intent_api(self, text: str, user_id: Optional[str]) -> Dict[str, Any]:
+    async def _call_intent_api(
+        self,
+        text: str,
+        user_id: Optional[str],
+        now_iso: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Appelle l'API d'analyse d'intention.
         
         Args:
             text: Texte à analyser
             user_id: ID de l'utilisateur
+            now_iso: Horodatage ISO de la requête (optionnel)
             
         Returns:
             Réponse de l'API
         """
+        now_iso = now_iso or datetime.now().isoformat()
+        if self._breaker_is_open():
+            return self._fallback_intent_analysis(text, now_iso)
+        
         payload = {
             "text": text,
             "user_id": user_id,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         }
         
         try:
             response = await self.http_client.post(
-                f"{self.base_url}/api/intent",
-                json=payload,
-                headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+                self._intent_url,
+                content=_encode_payload(payload),
+                headers=self._call_headers
             )
             response.raise_for_status()
-            return response.json()
+            self._breaker_failures = 0
+            return _decode_response(response)
             
         except httpx.HTTPError as e:
-            self.logger.warning(f"API IA non disponible, utilisation du fallback: {e}")
+            self._record_api_failure()
+            self.logger.warning("API IA non disponible, utilisation du fallback: %s", e)
             # Fallback local
-            return self._fallback_intent_analysis(text)
+            return self._fallback_intent_analysis(text, now_iso)
+    
+    def _breaker_is_open(self) -> bool:
+        """Indique si le disjoncteur court-circuite les appels d'API vers le fallback."""
+        return time.monotonic() < self._breaker_open_until
+    
+    def _record_api_failure(self):
+        """Comptabilise un échec d'API et ouvre le disjoncteur au-delà du seuil."""
+        now = time.monotonic()
+        if self._breaker_failures == 0 or now - self._breaker_first_failure > self._BREAKER_WINDOW:
+            self._breaker_failures = 0
+            self._breaker_first_failure = now
+        self._breaker_failures += 1
+        
+        if self._breaker_failures >= self._BREAKER_FAILURE_THRESHOLD:
+            self._breaker_open_until = now + self._BREAKER_COOLDOWN
+            self._breaker_failures = 0
+            self.logger.warning(
+                "API IA indisponible, appels court-circuités pendant %.0fs",
+                self._BREAKER_COOLDOWN
+            )
     
-    def _fallback_intent_analysis(self, text: str) -> Dict[str, Any]:
+    def _fallback_intent_analysis(self, text: str, now_iso: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyse d'intention de fallback local.
         
         Args:
             text: Texte à analyser
+            now_iso: Horodatage ISO de la requête (optionnel)
             
         Returns:
             Analyse d'intention basique
         """
-        text_lower = text.lower()
-        
-        # Détection basique d'intention
-        if any(word in text_lower for word in ["allume", "éteins", "active", "désactive"]):
-            intent_type = "control"
-            entities = {"action": "toggle"}
-        elif any(word in text_lower for word in ["combien", "quelle", "quel", "état"]):
-            intent_type = "query"
-            entities = {"query_type": "status"}
-        elif any(word in text_lower for word in ["scène", "mode", "ambiance"]):
-            intent_type = "scene"
-            entities = {"scene_type": "ambiance"}
-        else:
-            intent_type = "control"
-            entities = {}
+        # Détection basique d'intention (mémorisée pour les textes répétés)
+        intent_type, entities = _classify_fallback_intent(text.casefold())
         
         return {
             "type": intent_type,
             "confidence": 0.7,
-            "entities": entities,
-            "timestamp": datetime.now().isoformat()
+            "entities": dict(entities),
+            "timestamp": now_iso or datetime.now().isoformat()
         }
     
     async def get_context(self, user_id: Optional[str] = None) -> Context:
@@ -249,13 +442,51 @@ class AIService:
         Returns:
             Contexte actuel
         """
-        cache_key = f"context:{user_id}:{datetime.now().hour}"
-        if cache_key in self._context_cache:
-            return self._context_cache[cache_key]
+        # La fraîcheur est gouvernée par context_cache_ttl : l'ID utilisateur suffit comme clé
+        cache_key = user_id
+        cached_context = self._get_cached_context(cache_key)
+        if cached_context is not None:
+            return cached_context
         
+        lock = self._context_locks.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                cached_context = self._get_cached_context(cache_key)
+                if cached_context is not None:
+                    return cached_context
+                return await self._load_context(user_id, cache_key)
+        finally:
+            if self._context_locks.get(cache_key) is lock and not lock.locked():
+                del self._context_locks[cache_key]
+    
+    def _get_cached_context(self, cache_key: Optional[str]) -> Optional[Context]:
+        """Retourne un contexte en cache s'il n'a pas expiré."""
+        cached_entry = self._cache_get(self._context_cache, cache_key)
+        if cached_entry is None:
+            return None
+        cached_context, expires_at = cached_entry
+        if expires_at > time.monotonic():
+            return cached_context
+        del self._context_cache[cache_key]
+        return None
+    
+    async def _load_context(self, user_id: Optional[str], cache_key: Optional[str]) -> Context:
+        """
+        Construit un contexte absent du cache et le met en cache.
+        
+        Args:
+            user_id: ID de l'utilisateur
+            cache_key: Clé de cache du contexte
+            
+        Returns:
+            Contexte actuel
+        """
+        now = datetime.now()
+        now_iso = now.isoformat()
         try:
             # Récupération des données de contexte
-            context_data = await self._gather_context_data(user_id)
+            context_data = await self._gather_context_data(user_id, now)
+            timestamp = context_data.get("timestamp")
             
             # Création du contexte
             context = Context(
@@ -266,28 +497,38 @@ class AIService:
                 device_states=context_data.get("device_states", {}),
                 user_preferences=context_data.get("user_preferences", {}),
                 recent_actions=context_data.get("recent_actions", []),
-                timestamp=datetime.fromisoformat(context_data.get("timestamp", datetime.now().isoformat()))
+                timestamp=self._parse_timestamp(timestamp, now, now_iso)
             )
             
             # Mise en cache
-            self._context_cache[cache_key] = context
+            self._cache_put(
+                self._context_cache,
+                cache_key,
+                (context, time.monotonic() + self.context_cache_ttl),
+                self.context_cache_size
+            )
             
             return context
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération du contexte: {e}")
+            self.logger.error("Erreur lors de la récupération du contexte: %s", e)
             # Retour d'un contexte par défaut
             return Context(
                 user_id=user_id,
-                timestamp=datetime.now()
+                timestamp=now
             )
     
-    async def _gather_context_data(self, user_id: Optional[str]) -> Dict[str, Any]:
+    async def _gather_context_data(
+        self,
+        user_id: Optional[str],
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Rassemble les données de contexte.
         
         Args:
             user_id: ID de l'utilisateur
+            now: Horodatage de la requête (optionnel)
             
         Returns:
             Données de contexte
@@ -295,7 +536,8 @@ class AIService:
         # Ici, on devrait récupérer les données depuis diverses sources
         # Pour l'instant, on retourne des données simulées
         
-        current_hour = datetime.now().hour
+        now = now or datetime.now()
+        current_hour = now.hour
         time_of_day = "night"
         
         return {
@@ -305,7 +547,7 @@ class AIService:
             "device_states": {},
             "user_preferences": {"theme": "auto", "language": "fr"},
             "recent_actions": [],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
     
     async def make_decision(
@@ -325,11 +567,14 @@ class AIService:
         Returns:
             Décision prise
         """
+        now = datetime.now()
+        now_iso = now.isoformat()
         try:
             # Appel à l'API de décision
-            decision_data = await self._call_decision_api(intent, context, available_actions)
+            decision_data = await self._call_decision_api(intent, context, available_actions, now_iso)
             
             # Création de la décision
+            timestamp = decision_data.get("timestamp")
             decision = Decision(
                 action=decision_data.get("action", "noop"),
                 target=decision_data.get("target", ""),
@@ -337,14 +582,14 @@ class AIService:
                 confidence=decision_data.get("confidence", 0.5),
                 reasoning=decision_data.get("reasoning", "No reasoning provided"),
                 alternatives=decision_data.get("alternatives", []),
-                timestamp=datetime.fromisoformat(decision_data.get("timestamp", datetime.now().isoformat()))
+                timestamp=self._parse_timestamp(timestamp, now, now_iso)
             )
             
-            self.logger.info(f"Décision prise: {decision.action} sur {decision.target}")
+            self.logger.info("Décision prise: %s sur %s", decision.action, decision.target)
             return decision
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de la prise de décision: {e}")
+            self.logger.error("Erreur lors de la prise de décision: %s", e)
             # Décision de fallback
             return Decision(
                 action="noop",
@@ -353,14 +598,41 @@ class AIService:
                 confidence=0.1,
                 reasoning=f"Erreur: {str(e)}",
                 alternatives=[],
-                timestamp=datetime.now()
+                timestamp=now
             )
     
+    async def make_decisions(
+        self,
+        intents: List[Intent],
+        context: Context,
+        available_actions: List[Dict[str, Any]]
+    ) -> List[Decision]:
+        """
+        Prend plusieurs décisions en parallèle pour un même contexte.
+        
+        Args:
+            intents: Intentions utilisateur
+            context: Contexte actuel
+            available_actions: Actions disponibles
+            
+        Returns:
+            Décisions prises, dans l'ordre des intentions
+        """
+        # Borné par le pool de connexions persistantes du client HTTP
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        
+        async def decide(intent: Intent) -> Decision:
+            async with semaphore:
+                return await self.make_decision(intent, context, available_actions)
+        
+        return list(await asyncio.gather(*(decide(intent) for intent in intents)))
+    
     async def _call_decision_api(
         self,
         intent: Intent,
         context: Context,
-        available_actions: List[Dict[str, Any]]
+        available_actions: List[Dict[str, Any]],
+        now_iso: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Appelle l'API de prise de décision.
@@ -369,36 +641,44 @@ class AIService:
             intent: Intention utilisateur
             context: Contexte actuel
             available_actions: Actions disponibles
+            now_iso: Horodatage ISO de la requête (optionnel)
             
         Returns:
             Réponse de l'API
         """
+        now_iso = now_iso or datetime.now().isoformat()
+        if self._breaker_is_open():
+            return self._fallback_decision(intent, context, available_actions, now_iso)
+        
         payload = {
             "intent": intent.to_dict(),
             "context": context.to_dict(),
             "available_actions": available_actions,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso
         }
         
         try:
             response = await self.http_client.post(
-                f"{self.base_url}/api/decision",
-                json=payload,
-                headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+                self._decision_url,
+                content=_encode_payload(payload),
+                headers=self._call_headers
             )
             response.raise_for_status()
-            return response.json()
+            self._breaker_failures = 0
+            return _decode_response(response)
             
         except httpx.HTTPError as e:
-            self.logger.warning(f"API de décision non disponible, utilisation du fallback: {e}")
+            self._record_api_failure()
+            self.logger.warning("API de décision non disponible, utilisation du fallback: %s", e)
             # Fallback local
-            return self._fallback_decision(intent, context, available_actions)
+            return self._fallback_decision(intent, context, available_actions, now_iso)
     
     def _fallback_decision(
         self,
         intent: Intent,
         context: Context,
-        available_actions: List[Dict[str, Any]]
+        available_actions: List[Dict[str, Any]],
+        now_iso: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Prise de décision de fallback local.
@@ -407,13 +687,15 @@ class AIService:
             intent: Intention utilisateur
             context: Contexte actuel
             available_actions: Actions disponibles
+            now_iso: Horodatage ISO de la requête (optionnel)
             
         Returns:
             Décision basique
         """
-        # Logique de décision basique
-        if intent.type == IntentType.CONTROL and "light" in intent.text.lower():
-            action = "turn_on" if "allume" in intent.text.lower() else "turn_off"
+        # Logique de décision basique (texte normalisé une seule fois)
+        text_folded = intent.text.casefold()
+        if intent.type == IntentType.CONTROL and "light" in text_folded:
+            action = "turn_on" if "allume" in text_folded else "turn_off"
             target = "living_room_light"
             reasoning = "Contrôle basique de lumière basé sur l'intention"
         elif intent.type == IntentType.QUERY:
@@ -432,7 +714,7 @@ class AIService:
             "confidence": 0.6,
             "reasoning": reasoning,
             "alternatives": [],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso or datetime.now().isoformat()
         }
     
     async def execute_decision(self, decision: Decision, device_manager: Any) -> Dict[str, Any]:
@@ -446,12 +728,13 @@ class AIService:
         Returns:
             Résultat de l'exécution
         """
+        timestamp = datetime.now().isoformat()
         try:
             # Conversion de la décision en commande
             command = self._decision_to_command(decision)
             
-            # Exécution via le device manager
-            if hasattr(device_manager, 'set_device_state'):
+            # Exécution via le device manager (interface vérifiée une fois par type)
+            if self._supports_set_device_state(device_manager):
                 result = await device_manager.set_device_state(
                     decision.target,
                     command
@@ -459,21 +742,44 @@ class AIService:
             else:
                 result = {"status": "error", "message": "Device manager non compatible"}
             
-            self.logger.info(f"Décision exécutée: {decision.action} -> {result}")
+            self.logger.info("Décision exécutée: %s -> %s", decision.action, result)
             return {
                 "decision": decision.to_dict(),
                 "execution_result": result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'exécution de la décision: {e}")
+            self.logger.error("Erreur lors de l'exécution de la décision: %s", e)
             return {
                 "decision": decision.to_dict(),
                 "execution_result": {"status": "error", "message": str(e)},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
     
+    def _supports_set_device_state(self, device_manager: Any) -> bool:
+        """
+        Indique si un device manager expose set_device_state.
+        
+        Seule la présence de la méthode sur la classe est mémorisée par type :
+        une réponse négative n'est pas mise en cache, car deux instances d'un
+        même type peuvent différer (attribut d'instance, mocks) et le repli
+        hasattr reste donc évalué à chaque appel pour ces types.
+        
+        Args:
+            device_manager: Gestionnaire de devices
+            
+        Returns:
+            True si compatible, False sinon
+        """
+        manager_type = type(device_manager)
+        supported = self._device_manager_support.get(manager_type)
+        if supported is None:
+            supported = callable(getattr(manager_type, 'set_device_state', None))
+            self._device_manager_support[manager_type] = supported
+        # Repli par instance pour les managers dynamiques, volontairement non mémorisé
+        return supported or hasattr(device_manager, 'set_device_state')
+    
     def _decision_to_command(self, decision: Decision) -> Dict[str, Any]:
         """
         Convertit une décision en commande de device.
@@ -484,19 +790,71 @@ class AIService:
         Returns:
             Commande de device
         """
-        command_map = {
-            "turn_on": {"on": True},
-            "turn_off": {"on": False},
-            "set_brightness": {"bri": decision.parameters.get("brightness", 100)},
-            "set_color": {"hue": decision.parameters.get("hue", 0), "sat": decision.parameters.get("saturation", 100)},
-            "query_status": {"query": "status"}
-        }
+        static_command = self._STATIC_COMMANDS.get(decision.action)
+        if static_command is not None:
+            # Copie superficielle : le device manager peut modifier la commande
+            return dict(static_command)
+        
+        build_command = self._DYNAMIC_COMMANDS.get(decision.action)
+        if build_command is not None:
+            return build_command(decision.parameters)
+        
+        return {}
+    
+    @staticmethod
+    def _parse_timestamp(timestamp: Optional[str], now: datetime, now_iso: str) -> datetime:
+        """
+        Convertit l'horodatage d'une réponse, sans aller-retour ISO pour celui de la requête.
+        
+        Args:
+            timestamp: Horodatage ISO renvoyé (optionnel)
+            now: Instantané de la requête
+            now_iso: Instantané de la requête au format ISO
+            
+        Returns:
+            Horodatage à associer au résultat
+        """
+        if not timestamp or timestamp == now_iso:
+            return now
+        return datetime.fromisoformat(timestamp)
+    
+    @staticmethod
+    def _cache_get(cache: "OrderedDict[Hashable, Any]", key: Hashable) -> Any:
+        """
+        Lit une entrée d'un cache LRU et la marque comme récemment utilisée.
+        
+        Args:
+            cache: Cache LRU
+            key: Clé de cache
+            
+        Returns:
+            Valeur en cache ou None
+        """
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    @staticmethod
+    def _cache_put(cache: "OrderedDict[Hashable, Any]", key: Hashable, value: Any, max_size: int):
+        """
+        Écrit une entrée dans un cache LRU en évinçant les moins récemment utilisées.
         
-        return command_map.get(decision.action, {})
+        Args:
+            cache: Cache LRU
+            key: Clé de cache
+            value: Valeur à mettre en cache
+            max_size: Nombre maximal d'entrées
+        """
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
     
     async def close(self):
         """Ferme les connexions."""
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
         self.logger.info("AIService fermé")
     
     def clear_cache(self):
@@ -6,57 +6,161 @@ incluant les informations environnementales, les préférences,
 et l'historique des actions.
 """
 
-import os
 import json
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, cast
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List, Set, Tuple, Union, Callable, Awaitable, cast
+from datetime import date, datetime
+from functools import lru_cache
+from dataclasses import dataclass
 
 import httpx
-import redis
+import redis.asyncio as redis
 
-from .ai_service import Context
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur json
+    orjson = None
 
+from .ai_service import Context, HTTP2_AVAILABLE
 
-@dataclass
+
+def _dumps(data: Dict[str, Any]) -> Union[bytes, str]:
+    """Sérialise des données de contexte pour Redis."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data)
+
+
+def _loads(raw: Union[bytes, str]) -> Any:
+    """Désérialise une valeur lue depuis Redis, sans décodage préalable des bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=12)
+def _season_for_month(month: int) -> str:
+    """Détermine la saison d'un mois (1-12)."""
+    if month in (12, 1, 2):
+        return "winter"
+    elif month in (3, 4, 5):
+        return "spring"
+    elif month in (6, 7, 8):
+        return "summer"
+    else:
+        return "autumn"
+
+
+@lru_cache(maxsize=8)
+def _day_info(day: date) -> Tuple[str, bool, str]:
+    """Retourne (jour de la semaine, week-end, saison) ; ne change qu'une fois par jour."""
+    return day.strftime("%A"), day.weekday() >= 5, _season_for_month(day.month)
+
+
+# Pipeline Redis de la requête en cours : les écritures du cache y sont
+# accumulées puis envoyées en un seul aller-retour à la fin de get_context
+_write_pipeline: ContextVar[Optional[Any]] = ContextVar("_write_pipeline", default=None)
+
+# Horodatage unique de la requête en cours, partagé par toutes les sources
+_request_now: ContextVar[Optional[datetime]] = ContextVar("_request_now", default=None)
+
+
+@dataclass(slots=True, frozen=True)
 class ContextSource:
     """Source de données de contexte."""
     name: str
     priority: int
     cache_ttl: int  # en secondes
     enabled: bool = True
+    stale_ttl: int = 0  # durée (secondes) pendant laquelle une valeur expirée reste servie
+    max_ttl: int = 0  # TTL maximal atteint par doublement tant que la valeur ne change pas (0 : TTL fixe)
 
 
 class ContextManager:
     """Gestionnaire de contexte."""
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 50,
+        keepalive_expiry: float = 30.0,
+        local_cache_size: int = 10000
+    ):
         """
         Initialise le gestionnaire de contexte.
         
         Args:
-            redis_client: Client Redis pour le cache (optionnel)
+            redis_client: Client Redis pour le cache (optionnel). Un client
+                redis.asyncio est recommandé ; un client synchrone est accepté et ses
+                appels sont exécutés hors de la boucle d'événements. Il est attendu
+                avec decode_responses=False (valeur par défaut) : les valeurs lues
+                sont des bytes, transmis tels quels au décodeur JSON.
+            max_connections: Nombre maximal de connexions HTTP simultanées
+            max_keepalive_connections: Nombre de connexions HTTP conservées ouvertes
+            keepalive_expiry: Durée de conservation d'une connexion inactive (secondes)
+            local_cache_size: Nombre maximal d'entrées du cache local (LRU)
         """
         self.logger = logging.getLogger(__name__)
         self.redis_client = redis_client
-        self.http_client = httpx.AsyncClient(timeout=10.0)
+        self._redis_is_async = isinstance(redis_client, redis.Redis)
+        self.http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=10.0
+        )
         
         # Sources de contexte
-        self.sources = [
-cache_ttl = os.getenv("cache_ttl", "3600")
-cache_ttl = os.getenv("cache_ttl", "30")
-cache_ttl = os.getenv("cache_ttl", "300")
-cache_ttl = os.getenv("cache_ttl", "1800")
-cache_ttl = os.getenv("cache_ttl", "60")
-cache_ttl = os.getenv("cache_ttl", "900")
-        ]
+        self.sources = (
+            ContextSource(name="user_profile", priority=1, cache_ttl=3600, stale_ttl=3600),
+            ContextSource(name="device_states", priority=2, cache_ttl=30, max_ttl=240),
+            ContextSource(name="environment", priority=3, cache_ttl=300, max_ttl=1200),
+            ContextSource(name="weather", priority=4, cache_ttl=1800, stale_ttl=1800, max_ttl=7200),
+            ContextSource(name="time", priority=5, cache_ttl=60),
+            ContextSource(name="history", priority=6, cache_ttl=900),
+        )
+        self._refresh_sources()
+        
+        # Table de récupération par source
+        self._fetchers: Dict[str, Callable[[Optional[str]], Awaitable[Dict[str, Any]]]] = {
+            "user_profile": self._get_user_profile,
+            "device_states": self._get_device_states,
+            "environment": self._get_environment_data,
+            "weather": self._get_weather_data,
+            "time": self._get_time_source_data,
+            "history": self._get_history_data,
+        }
         
-        # Cache local
-        self._local_cache: Dict[str, Dict[str, Any]] = {}
+        # Cache local LRU : clé -> (expiration, fin de fraîcheur, données) en temps monotone
+        self.local_cache_size = local_cache_size
+        self._local_cache: "OrderedDict[str, Tuple[float, float, Dict[str, Any]]]" = OrderedDict()
+        
+        # Rafraîchissements en arrière-plan (stale-while-revalidate)
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        
+        # TTL adaptatif : clé -> (TTL courant, empreinte de la dernière valeur)
+        self._adaptive_ttls: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        
+        # Construction de contexte en cours, par utilisateur (single-flight)
+        self._inflight: Dict[Optional[str], asyncio.Task] = {}
         
         self.logger.info("ContextManager initialisé")
     
+    async def __aenter__(self) -> "ContextManager":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
     async def get_context(self, user_id: Optional[str] = None) -> Context:
         """
         Récupère le contexte complet.
@@ -67,39 +171,89 @@ cache_ttl = os.getenv("cache_ttl", "900")
         Returns:
             Contexte complet
         """
-        context_data = {}
+        # Les appels concurrents pour un même utilisateur partagent la même construction
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._build_context(user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(user_id, None))
         
-        # Récupération des données de chaque source
-        for source in sorted(self.sources, key=lambda x: x.priority):
-            if not source.enabled:
-                continue
+        # shield : l'annulation d'un appelant n'interrompt pas les autres
+        return await asyncio.shield(task)
+    
+    async def _build_context(self, user_id: Optional[str]) -> Context:
+        """
+        Construit le contexte complet à partir des sources.
+        
+        Args:
+            user_id: ID de l'utilisateur (optionnel)
             
-            try:
-                source_data = await self._get_source_data(source.name, user_id)
-                if source_data:
-                    context_data[source.name] = source_data
-                    self.logger.debug(f"Données de contexte récupérées depuis {source.name}")
-            except Exception as e:
-                self.logger.warning(f"Erreur lors de la récupération de {source.name}: {e}")
+        Returns:
+            Contexte complet
+        """
+        context_data = {}
+        now = datetime.now()
         
-        # Fusion des données
-        merged_data = self._merge_context_data(context_data, user_id)
+        # Récupération concurrente des données de chaque source
+        sources = self._enabled_sources
+        cache_keys = {source.name: self._get_cache_key(source.name, user_id) for source in sources}
         
-        # Création du contexte
-        context = Context(
-            user_id=user_id,
-            location=merged_data.get("location"),
-            time_of_day=merged_data.get("time_of_day"),
-            weather=merged_data.get("weather"),
-            device_states=merged_data.get("device_states", {}),
-            user_preferences=merged_data.get("user_preferences", {}),
-            recent_actions=merged_data.get("recent_actions", []),
-            timestamp=datetime.now()
-        )
+        # Lecture groupée du cache : un seul aller-retour Redis
+        cached = await self._bulk_get_cached(list(cache_keys.values()))
         
-        self.logger.info(f"Contexte récupéré pour l'utilisateur {user_id or 'anonyme'}")
+        # Les valeurs périmées sont servies et rafraîchies en arrière-plan
+        for source in sources:
+            cache_key = cache_keys[source.name]
+            if source.stale_ttl and cache_key in cached and self._local_is_stale(cache_key):
+                self._schedule_refresh(source.name, user_id, cache_key)
+        
+        # Seules les sources absentes du cache sont récupérées
+        misses = [source for source in sources if cache_keys[source.name] not in cached]
+        pipeline = self.redis_client.pipeline(transaction=False) if misses and self.redis_client else None
+        token = _write_pipeline.set(pipeline)
+        now_token = _request_now.set(now)
+        try:
+            tasks = [
+                asyncio.create_task(self._fetch_source_data(source.name, user_id, cache_keys[source.name]))
+                for source in misses
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            _request_now.reset(now_token)
+            _write_pipeline.reset(token)
+        await self._flush_pipeline(pipeline)
+        fetched = {source.name: result for source, result in zip(misses, results)}
+        
+        # Les résultats sont fusionnés dans l'ordre de priorité
+        for source in sources:
+            cache_key = cache_keys[source.name]
+            source_data = cached[cache_key] if cache_key in cached else fetched[source.name]
+            if isinstance(source_data, Exception):
+                self.logger.warning("Erreur lors de la récupération de %s: %s", source.name, source_data)
+            elif source_data:
+                context_data[source.name] = source_data
+                self.logger.debug("Données de contexte récupérées depuis %s", source.name)
+        
+        # Fusion des données et création du contexte
+        context = self._merge_context_data(context_data, user_id, now)
+        
+        self.logger.info("Contexte récupéré pour l'utilisateur %s", user_id or 'anonyme')
         return context
     
+    def _refresh_sources(self):
+        """
+        Recalcule l'ordre de priorité des sources actives.
+        
+        Les sources étant immuables, les modifier revient à remplacer self.sources
+        (par exemple avec dataclasses.replace) puis à appeler cette méthode.
+        """
+        self._sorted_sources = tuple(sorted(self.sources, key=lambda x: x.priority))
+        self._enabled_sources = tuple(source for source in self._sorted_sources if source.enabled)
+        self._by_name: Dict[str, ContextSource] = {source.name: source for source in self.sources}
+        self._ttl_by_source: Dict[str, int] = {source.name: source.cache_ttl for source in self.sources}
+        self._stale_ttl_by_source: Dict[str, int] = {source.name: source.stale_ttl for source in self.sources}
+        self._max_ttl_by_source: Dict[str, int] = {source.name: source.max_ttl for source in self.sources}
+    
     async def _get_source_data(self, source_name: str, user_id: Optional[str]) -> Dict[str, Any]:
         """
         Récupère les données d'une source spécifique.
@@ -117,25 +271,32 @@ cache_ttl = os.getenv("cache_ttl", "900")
         if cached_data:
             return cached_data
         
+        return await self._fetch_source_data(source_name, user_id, cache_key)
+    
+    async def _fetch_source_data(self, source_name: str, user_id: Optional[str], cache_key: str) -> Dict[str, Any]:
+        """
+        Récupère les données d'une source sans consulter le cache, puis les met en cache.
+        
+        Args:
+            source_name: Nom de la source
+            user_id: ID de l'utilisateur
+            cache_key: Clé de cache de la source
+            
+        Returns:
+            Données de la source
+        """
         # Récupération des données
-        if source_name == "user_profile":
-            data = await self._get_user_profile(user_id)
-        elif source_name == "device_states":
-            data = await self._get_device_states(user_id)
-        elif source_name == "environment":
-            data = await self._get_environment_data(user_id)
-        elif source_name == "weather":
-            data = await self._get_weather_data(user_id)
-        elif source_name == "time":
-            data = self._get_time_data()
-        elif source_name == "history":
-            data = await self._get_history_data(user_id)
-        else:
-            data = {}
+        fetcher = self._fetchers.get(source_name)
+        data = await fetcher(user_id) if fetcher else {}
         
         # Mise en cache
         if data:
-            await self._cache_data(cache_key, data, self._get_source_ttl(source_name))
+            await self._cache_data(
+                cache_key,
+                data,
+                self._get_adaptive_ttl(source_name, cache_key, data),
+                self._stale_ttl_by_source.get(source_name, 0)
+            )
         
         return data
     
@@ -167,7 +328,7 @@ cache_ttl = os.getenv("cache_ttl", "900")
                 "routines": ["morning", "evening", "sleep"]
             }
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération du profil: {e}")
+            self.logger.error("Erreur lors de la récupération du profil: %s", e)
             return {}
     
     async def _get_device_states(self, user_id: Optional[str]) -> Dict[str, Any]:
@@ -190,7 +351,7 @@ cache_ttl = os.getenv("cache_ttl", "900")
                 "living_room_tv": {"on": True, "source": "netflix"}
             }
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération des états: {e}")
+            self.logger.error("Erreur lors de la récupération des états: %s", e)
             return {}
     
     async def _get_environment_data(self, user_id: Optional[str]) -> Dict[str, Any]:
@@ -214,7 +375,7 @@ cache_ttl = os.getenv("cache_ttl", "900")
                 "motion_detected": True
             }
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération environnementale: {e}")
+            self.logger.error("Erreur lors de la récupération environnementale: %s", e)
             return {}
     
     async def _get_weather_data(self, user_id: Optional[str]) -> Dict[str, Any]:
@@ -238,35 +399,53 @@ cache_ttl = os.getenv("cache_ttl", "900")
                 "sunset": "18:45"
             }
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération météo: {e}")
+            self.logger.error("Erreur lors de la récupération météo: %s", e)
             return {}
     
-    def _get_time_data(self) -> Dict[str, Any]:
+    async def _get_time_source_data(self, user_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Adapte _get_time_data à la signature des sources de contexte.
+        
+        Args:
+            user_id: ID de l'utilisateur (ignoré)
+            
+        Returns:
+            Données temporelles
+        """
+        return self._get_time_data(_request_now.get())
+    
+    def _get_time_data(self, now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Récupère les données temporelles.
         
+        Args:
+            now: Horodatage de référence (par défaut, l'heure courante)
+            
         Returns:
             Données temporelles
         """
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         current_hour = now.hour
         
         # Détermination du moment de la journée
         if current_hour < 6:
-time_of_day = os.getenv("time_of_day", "night")
+            time_of_day = "night"
         elif current_hour < 12:
-time_of_day = os.getenv("time_of_day", "morning")
+            time_of_day = "morning"
         elif current_hour < 18:
-time_of_day = os.getenv("time_of_day", "afternoon")
+            time_of_day = "afternoon"
         else:
-time_of_day = os.getenv("time_of_day", "evening")
+            time_of_day = "evening"
+        
+        day_of_week, is_weekend, season = _day_info(now.date())
         
         return {
             "time_of_day": time_of_day,
             "hour": current_hour,
-            "day_of_week": now.strftime("%A"),
-            "is_weekend": now.weekday() >= 5,
-            "season": self._get_season(now.month)
+            "day_of_week": day_of_week,
+            "is_weekend": is_weekend,
+            "season": season
         }
     
     async def _get_history_data(self, user_id: Optional[str]) -> Dict[str, Any]:
@@ -283,6 +462,12 @@ time_of_day = os.getenv("time_of_day", "evening")
             return {"recent_actions": []}
         
         try:
+            # Actions enregistrées par add_action_to_history (liste Redis, la plus récente en tête)
+            if self.redis_client:
+                raw_actions = await self._run_redis(self.redis_client.lrange, self._get_history_key(user_id), 0, 9)
+                if raw_actions:
+                    return {"recent_actions": [_loads(raw) for raw in reversed(raw_actions)]}
+            
             # Ici, on devrait récupérer depuis une base de données
             return {
                 "recent_actions": [
@@ -292,42 +477,42 @@ time_of_day = os.getenv("time_of_day", "evening")
                 ]
             }
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération de l'historique: {e}")
+            self.logger.error("Erreur lors de la récupération de l'historique: %s", e)
             return {"recent_actions": []}
     
-    def _merge_context_data(self, context_data: Dict[str, Dict[str, Any]], user_id: Optional[str]) -> Dict[str, Any]:
+    def _merge_context_data(
+        self,
+        context_data: Dict[str, Dict[str, Any]],
+        user_id: Optional[str],
+        timestamp: Optional[datetime] = None
+    ) -> Context:
         """
-        Fusionne les données de contexte.
+        Fusionne les données de contexte en un Context.
         
         Args:
             context_data: Données de contexte par source
             user_id: ID de l'utilisateur
+            timestamp: Horodatage du contexte (optionnel)
             
         Returns:
-            Données fusionnées
+            Contexte fusionné
         """
-        merged = {
-            "device_states": {},
-            "user_preferences": {},
-            "recent_actions": []
-        }
+        profile = context_data.get("user_profile", {})
+        environment = context_data.get("environment", {})
+        time_data = context_data.get("time", {})
+        history = context_data.get("history", {})
         
-        # Fusion des données de chaque source
-        for source_name, data in context_data.items():
-            if source_name == "user_profile":
-                merged["user_preferences"].update(data.get("preferences", {}))
-            elif source_name == "device_states":
-                merged["device_states"].update(data)
-            elif source_name == "environment":
-                merged["location"] = data.get("location")
-            elif source_name == "weather":
-                merged["weather"] = data
-            elif source_name == "time":
-                merged["time_of_day"] = data.get("time_of_day")
-            elif source_name == "history":
-                merged["recent_actions"] = data.get("recent_actions", [])
-        
-        return merged
+        # Les dictionnaires issus du cache sont copiés pour ne pas être modifiés en place
+        return Context(
+            user_id=user_id,
+            location=environment.get("location"),
+            time_of_day=time_data.get("time_of_day"),
+            weather=context_data.get("weather"),
+            device_states=dict(context_data.get("device_states", {})),
+            user_preferences=dict(profile.get("preferences", {})),
+            recent_actions=history.get("recent_actions", []),
+            timestamp=timestamp
+        )
     
     async def _get_cached_data(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """
@@ -340,28 +525,82 @@ time_of_day = os.getenv("time_of_day", "evening")
             Données en cache ou None
         """
         # Cache local
-        if cache_key in self._local_cache:
-            return self._local_cache[cache_key]
+        data = self._local_get(cache_key)
+        if data is not None:
+            return data
         
         # Cache Redis
         if self.redis_client:
             try:
-                cached = self.redis_client.get(cache_key)
-                if cached:
-                    # Convertir bytes en string si nécessaire
-                    if isinstance(cached, bytes):
-                        cached_str = cached.decode('utf-8')
-                    else:
-                        cached_str = str(cached)
-                    data = json.loads(cached_str)
-                    self._local_cache[cache_key] = data
-                    return data
+                found = await self._redis_get_many([cache_key])
+                return found.get(cache_key)
             except Exception as e:
-                self.logger.warning(f"Erreur lors de la lecture du cache Redis: {e}")
+                self.logger.warning("Erreur lors de la lecture du cache Redis: %s", e)
         
         return None
     
-    async def _cache_data(self, cache_key: str, data: Dict[str, Any], ttl: int):
+    async def _bulk_get_cached(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Récupère plusieurs entrées du cache en un seul aller-retour Redis.
+        
+        Args:
+            keys: Clés de cache
+            
+        Returns:
+            Données en cache, indexées par clé (les absences sont omises)
+        """
+        # Cache local
+        found = {}
+        missing = []
+        for key in keys:
+            data = self._local_get(key)
+            if data is not None:
+                found[key] = data
+            else:
+                missing.append(key)
+        
+        # Cache Redis
+        if missing and self.redis_client:
+            try:
+                found.update(await self._redis_get_many(missing))
+            except Exception as e:
+                self.logger.warning("Erreur lors de la lecture groupée du cache Redis: %s", e)
+        
+        return found
+    
+    async def _redis_get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Lit des entrées Redis et leur durée de vie restante en un seul aller-retour.
+        
+        Les valeurs trouvées sont recopiées dans le cache local pour la durée qu'il
+        leur reste dans Redis (et non un TTL complet), avec le stale_ttl de leur source.
+        
+        Args:
+            keys: Clés de cache
+            
+        Returns:
+            Données trouvées, indexées par clé
+        """
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.mget(keys)
+        for key in keys:
+            pipeline.pttl(key)
+        values, *pttls = await self._run_redis(pipeline.execute)
+        
+        found = {}
+        for key, cached, pttl in zip(keys, values, pttls):
+            if not cached:
+                continue
+            data = _loads(cached)
+            found[key] = data
+            # -2 : clé expirée entre les deux lectures ; -1 : clé sans expiration
+            if pttl == -2:
+                continue
+            ttl = pttl / 1000 if pttl >= 0 else self._get_key_ttl(key)
+            self._local_set(key, data, ttl, self._get_key_stale_ttl(key))
+        return found
+    
+    async def _cache_data(self, cache_key: str, data: Dict[str, Any], ttl: int, stale_ttl: int = 0):
         """
         Met en cache les données.
         
@@ -369,16 +608,135 @@ time_of_day = os.getenv("time_of_day", "evening")
             cache_key: Clé de cache
             data: Données à mettre en cache
             ttl: Durée de vie en secondes
+            stale_ttl: Durée supplémentaire pendant laquelle la valeur reste servie localement
         """
         # Cache local
-        self._local_cache[cache_key] = data
+        self._local_set(cache_key, data, ttl, stale_ttl)
         
-        # Cache Redis
-        if self.redis_client:
+        # Cache Redis (différé si un pipeline est actif pour la requête)
+        pipeline = _write_pipeline.get()
+        if pipeline is not None:
+            pipeline.setex(cache_key, ttl, _dumps(data))
+        elif self.redis_client:
             try:
-                self.redis_client.setex(cache_key, ttl, json.dumps(data))
+                await self._run_redis(self.redis_client.setex, cache_key, ttl, _dumps(data))
             except Exception as e:
-                self.logger.warning(f"Erreur lors de l'écriture dans le cache Redis: {e}")
+                self.logger.warning("Erreur lors de l'écriture dans le cache Redis: %s", e)
+    
+    def _local_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit une entrée du cache local en respectant son expiration.
+        
+        Args:
+            cache_key: Clé de cache
+            
+        Returns:
+            Données en cache ou None si absentes ou expirées
+        """
+        entry = self._local_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, _, data = entry
+        if expires_at <= time.monotonic():
+            del self._local_cache[cache_key]
+            return None
+        
+        self._local_cache.move_to_end(cache_key)
+        return data
+    
+    def _local_set(self, cache_key: str, data: Dict[str, Any], ttl: float, stale_ttl: int = 0):
+        """
+        Écrit une entrée dans le cache local et évince les moins récemment utilisées.
+        
+        Args:
+            cache_key: Clé de cache
+            data: Données à mettre en cache
+            ttl: Durée de fraîcheur en secondes
+            stale_ttl: Durée supplémentaire pendant laquelle la valeur périmée reste servie
+        """
+        fresh_until = time.monotonic() + ttl
+        self._local_cache[cache_key] = (fresh_until + stale_ttl, fresh_until, data)
+        self._local_cache.move_to_end(cache_key)
+        while len(self._local_cache) > self.local_cache_size:
+            self._local_cache.popitem(last=False)
+    
+    def _local_is_stale(self, cache_key: str) -> bool:
+        """
+        Indique si une entrée du cache local a dépassé sa durée de fraîcheur.
+        
+        Args:
+            cache_key: Clé de cache
+            
+        Returns:
+            True si l'entrée existe mais doit être rafraîchie
+        """
+        entry = self._local_cache.get(cache_key)
+        return entry is not None and entry[1] <= time.monotonic()
+    
+    def _schedule_refresh(self, source_name: str, user_id: Optional[str], cache_key: str):
+        """
+        Lance le rafraîchissement d'une source en arrière-plan (une seule fois par clé).
+        
+        Args:
+            source_name: Nom de la source
+            user_id: ID de l'utilisateur
+            cache_key: Clé de cache de la source
+        """
+        if cache_key in self._refreshing:
+            return
+        
+        self._refreshing.add(cache_key)
+        task = asyncio.create_task(self._refresh_source(source_name, user_id, cache_key))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _refresh_source(self, source_name: str, user_id: Optional[str], cache_key: str):
+        """
+        Rafraîchit une source périmée.
+        
+        Args:
+            source_name: Nom de la source
+            user_id: ID de l'utilisateur
+            cache_key: Clé de cache de la source
+        """
+        try:
+            await self._fetch_source_data(source_name, user_id, cache_key)
+        except Exception as e:
+            self.logger.warning("Erreur lors du rafraîchissement de %s: %s", source_name, e)
+        finally:
+            self._refreshing.discard(cache_key)
+    
+    async def _run_redis(self, command: Callable[..., Any], *args: Any) -> Any:
+        """
+        Exécute une commande Redis sans bloquer la boucle d'événements.
+        
+        Args:
+            command: Méthode du client (ou du pipeline) Redis
+            *args: Arguments de la commande
+            
+        Returns:
+            Résultat de la commande
+        """
+        if self._redis_is_async:
+            return await command(*args)
+        # Client synchrone : l'appel bloquant est délégué au pool de threads
+        return await asyncio.to_thread(command, *args)
+    
+    async def _flush_pipeline(self, pipeline: Optional[Any]):
+        """
+        Envoie les écritures accumulées dans un pipeline Redis.
+        
+        Args:
+            pipeline: Pipeline Redis (optionnel)
+        """
+        if pipeline is None or not len(pipeline):
+            return
+        
+        try:
+            await self._run_redis(pipeline.execute)
+        except Exception as e:
+            self.logger.warning("Erreur lors de l'écriture dans le cache Redis: %s", e)
     
     def _get_cache_key(self, source_name: str, user_id: Optional[str]) -> str:
         """
@@ -391,9 +749,21 @@ time_of_day = os.getenv("time_of_day", "evening")
         Returns:
             Clé de cache
         """
+        # Pas d'horodatage dans la clé : la fraîcheur est gouvernée par le TTL de la source
         user_part = user_id or "anonymous"
-        timestamp = datetime.now().strftime("%Y%m%d%H")
-        return f"context:{source_name}:{user_part}:{timestamp}"
+        return f"context:{source_name}:{user_part}"
+    
+    def _get_history_key(self, user_id: str) -> str:
+        """
+        Génère la clé de la liste Redis d'historique d'un utilisateur.
+        
+        Args:
+            user_id: ID de l'utilisateur
+            
+        Returns:
+            Clé de la liste d'historique
+        """
+        return f"history:{user_id}"
     
     def _get_source_ttl(self, source_name: str) -> int:
         """
@@ -405,10 +775,67 @@ time_of_day = os.getenv("time_of_day", "evening")
         Returns:
             TTL en secondes
         """
-        for source in self.sources:
-            if source.name == source_name:
-                return source.cache_ttl
-        return 300  # Valeur par défaut
+        return self._ttl_by_source.get(source_name, 300)  # 300 : valeur par défaut
+    
+    def _get_adaptive_ttl(self, source_name: str, cache_key: str, data: Dict[str, Any]) -> int:
+        """
+        Calcule le TTL d'une valeur rafraîchie selon la stabilité de la source.
+        
+        Le TTL double à chaque rafraîchissement identique au précédent, jusqu'à
+        max_ttl, et revient au cache_ttl de la source dès que la valeur change.
+        
+        Args:
+            source_name: Nom de la source
+            cache_key: Clé de cache
+            data: Nouvelles données
+            
+        Returns:
+            TTL en secondes
+        """
+        base_ttl = self._get_source_ttl(source_name)
+        max_ttl = self._max_ttl_by_source.get(source_name, 0)
+        if max_ttl <= base_ttl:
+            return base_ttl
+        
+        fingerprint = hash(_dumps(data))
+        previous = self._adaptive_ttls.get(cache_key)
+        if previous is not None and previous[1] == fingerprint:
+            ttl = min(previous[0] * 2, max_ttl)
+        else:
+            ttl = base_ttl
+        
+        self._adaptive_ttls[cache_key] = (ttl, fingerprint)
+        self._adaptive_ttls.move_to_end(cache_key)
+        while len(self._adaptive_ttls) > self.local_cache_size:
+            self._adaptive_ttls.popitem(last=False)
+        
+        return ttl
+    
+    def _get_key_ttl(self, cache_key: str) -> int:
+        """
+        Retourne le TTL de la source associée à une clé de cache.
+        
+        Args:
+            cache_key: Clé de cache (context:<source>:<utilisateur>)
+            
+        Returns:
+            TTL en secondes
+        """
+        parts = cache_key.split(":", 2)
+        return self._get_source_ttl(parts[1] if len(parts) > 1 else "")
+    
+    def _get_key_stale_ttl(self, cache_key: str) -> int:
+        """
+        Retourne le stale_ttl de la source associée à une clé de cache.
+        
+        Args:
+            cache_key: Clé de cache (context:<source>:<utilisateur>)
+            
+        Returns:
+            Durée en secondes pendant laquelle une valeur périmée reste servie
+        """
+        parts = cache_key.split(":", 2)
+        return self._stale_ttl_by_source.get(parts[1] if len(parts) > 1 else "", 0)
     
     def _get_season(self, month: int) -> str:
         """
@@ -420,14 +847,7 @@ time_of_day = os.getenv("time_of_day", "evening")
         Returns:
             Saison
         """
-        if month in [12, 1, 2]:
-            return "winter"
-        elif month in [3, 4, 5]:
-            return "spring"
-        elif month in [6, 7, 8]:
-            return "summer"
-        else:
-            return "autumn"
+        return _season_for_month(month)
     
     async def update_context(self, context: Context, updates: Dict[str, Any]) -> Context:
         """
@@ -449,6 +869,17 @@ time_of_day = os.getenv("time_of_day", "evening")
         merged_device_states = {**cast(Dict[str, Any], context.device_states), **device_states_updates}
         merged_user_preferences = {**cast(Dict[str, Any], context.user_preferences), **user_preferences_updates}
         
+        # Les états en cache sont désormais obsolètes, localement comme dans Redis
+        # (sinon la prochaine lecture groupée les recopierait dans le cache local)
+        if device_states_updates:
+            cache_key = self._get_cache_key("device_states", context.user_id)
+            self._local_cache.pop(cache_key, None)
+            if self.redis_client:
+                try:
+                    await self._run_redis(self.redis_client.delete, cache_key)
+                except Exception as e:
+                    self.logger.warning("Erreur lors de l'invalidation du cache Redis: %s", e)
+        
         # Création d'un nouveau contexte avec les mises à jour
         updated_context = Context(
             user_id=updates.get("user_id", context.user_id),
@@ -477,8 +908,23 @@ time_of_day = os.getenv("time_of_day", "evening")
         
         try:
             # Ici, on devrait persister dans une base de données
-            # Pour l'instant, on met à jour le cache local
             cache_key = self._get_cache_key("history", user_id)
+            
+            if self.redis_client:
+                # Ajout incrémental côté serveur en un seul aller-retour ;
+                # le contexte "history" en cache est invalidé et sera relu depuis la liste
+                history_key = self._get_history_key(user_id)
+                pipeline = self.redis_client.pipeline(transaction=False)
+                pipeline.lpush(history_key, _dumps(action))
+                # Garder seulement les 10 dernières actions
+                pipeline.ltrim(history_key, 0, 9)
+                pipeline.expire(history_key, 900)
+                pipeline.delete(cache_key)
+                await self._run_redis(pipeline.execute)
+                self._local_cache.pop(cache_key, None)
+                return
+            
+            # Sans Redis, on met à jour le cache local
             cached_data = await self._get_cached_data(cache_key)
             
             if cached_data:
@@ -488,7 +934,7 @@ time_of_day = os.getenv("time_of_day", "evening")
                 cached_data["recent_actions"] = actions[-10:]
                 await self._cache_data(cache_key, cached_data, 900)
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'ajout à l'historique: {e}")
+            self.logger.error("Erreur lors de l'ajout à l'historique: %s", e)
     
     async def clear_cache(self, source_name: Optional[str] = None):
         """
@@ -506,7 +952,7 @@ time_of_day = os.getenv("time_of_day", "evening")
             # Effacer tout le cache
             self._local_cache.clear()
         
-        self.logger.info(f"Cache effacé pour {source_name or 'toutes les sources'}")
+        self.logger.info("Cache effacé pour %s", source_name or 'toutes les sources')
     
     async def close(self):
         """Ferme les connexions."""
@@ -5,27 +5,49 @@ Ce module prend des décisions intelligentes basées sur
 les intentions utilisateur, le contexte et les actions disponibles.
 """
 
+import asyncio
 import logging
 import os
 import random
-from typing import Dict, Any, List, Optional, Tuple
+from itertools import islice
+from collections import OrderedDict, defaultdict
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Collection, Iterator, Mapping
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
 import httpx
 
-from .ai_service import Intent, Context, Decision, IntentType
+from .ai_service import (
+    Intent,
+    Context,
+    Decision,
+    IntentType,
+    HTTP2_AVAILABLE,
+    _JSON_HEADERS,
+    _encode_payload,
+    _decode_response
+)
+from . import _decision_math as decision_math
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class DecisionRule:
-    """Règle de décision."""
-    condition: Dict[str, Any]
+    """Règle de décision (immuable, comparée et hachée par identité)."""
+    condition: Mapping[str, Any]
     action: str
     target: str
-    parameters: Dict[str, Any]
+    parameters: Mapping[str, Any]
     priority: int
     confidence: float = 1.0
+    
+    def __post_init__(self):
+        # Vues en lecture seule : une règle est partagée par toutes les décisions
+        object.__setattr__(self, "condition", MappingProxyType({
+            key: MappingProxyType(dict(value)) if isinstance(value, dict) else value
+            for key, value in self.condition.items()
+        }))
+        object.__setattr__(self, "parameters", MappingProxyType(dict(self.parameters)))
 
 
 @dataclass
@@ -39,6 +61,15 @@ class DecisionFactor:
 class DecisionEngine:
     """Moteur de décision."""
     
+    # Taille maximale du cache LRU des décisions
+    _CACHE_MAX = 1024
+    
+    # Clients HTTP partagés par tous les moteurs, un par boucle d'événements : un pool de
+    # connexions reste lié à la boucle qui l'a ouvert et devient inutilisable après sa fermeture
+    _shared_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+    _POOL_KEEPALIVE = 100
+    _POOL_MAX_CONNECTIONS = 200
+    
     def __init__(self, api_key: Optional[str] = None, base_url: str = os.getenv('ENTHROPIC_BASE_URL', 'http://localhost:8000')):
         """
         Initialise le moteur de décision.
@@ -50,23 +81,68 @@ class DecisionEngine:
         self.logger = logging.getLogger(__name__)
         self.api_key = api_key
         self.base_url = base_url
-        self.http_client = httpx.AsyncClient(timeout=30.0)
-        
-        # Règles de décision
+        self._decision_url = f"{base_url}/api/decision"
+        self._request_headers = (
+            {**_JSON_HEADERS, "Authorization": f"Bearer {api_key}"} if api_key else _JSON_HEADERS
+        )
+        # Règles de décision, indexées par type d'intention
         self.rules = self._initialize_rules()
+        self._rules_by_intent = self._index_rules(self.rules)
+        self._entity_types_by_intent = self._index_entity_types(self._rules_by_intent)
+        self._rules_by_keyword = self._index_rule_keywords(self.rules)
         
         # Facteurs de décision
         self.factors = self._initialize_factors()
         
-        # Cache des décisions
-        self._decision_cache: Dict[str, Decision] = {}
+        # Cache LRU des décisions : (type, texte, utilisateur, moment) -> décision
+        self._decision_cache: "OrderedDict[Tuple[IntentType, str, Optional[str], Optional[str]], Decision]" = OrderedDict()
         
         self.logger.info("DecisionEngine initialisé")
     
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Client HTTP partagé de la boucle d'événements courante."""
+        return self._get_client()
+    
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """
+        Retourne le client HTTP partagé de la boucle courante, créé à la première utilisation.
+        
+        Returns:
+            Client HTTP partagé
+        """
+        loop = asyncio.get_running_loop()
+        clients = cls._shared_clients
+        client = clients.get(loop)
+        if client is None or client.is_closed:
+            # Les clients des boucles déjà fermées ne peuvent plus servir : abandonnés
+            for closed_loop in [other for other in clients if other.is_closed()]:
+                del clients[closed_loop]
+            client = clients[loop] = httpx.AsyncClient(
+                timeout=30.0,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=cls._POOL_KEEPALIVE,
+                    max_connections=cls._POOL_MAX_CONNECTIONS
+                )
+            )
+        return client
+    
+    @classmethod
+    async def aclose_shared_client(cls):
+        """Ferme le client HTTP partagé de la boucle courante (à appeler avant son arrêt)."""
+        client = cls._shared_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
     def _initialize_rules(self) -> List[DecisionRule]:
         """
         Initialise les règles de décision.
         
+        Les valeurs d'entités attendues (clé « entities ») sont des frozensets pour un test
+        d'intersection en O(1).
+        
         Returns:
             Liste des règles
         """
@@ -129,6 +205,71 @@ class DecisionEngine:
             )
         ]
     
+    @staticmethod
+    def _index_rules(
+        rules: List[DecisionRule]
+    ) -> Dict[Optional[IntentType], Tuple[DecisionRule, ...]]:
+        """
+        Regroupe les règles par type d'intention.
+        
+        Args:
+            rules: Règles de décision
+            
+        Returns:
+            Règles par type d'intention (None : règles sans type, toujours évaluées)
+        """
+        buckets: Dict[Optional[IntentType], List[DecisionRule]] = defaultdict(list)
+        for rule in rules:
+            buckets[rule.condition.get("intent_type")].append(rule)
+        return {intent_type: tuple(bucket) for intent_type, bucket in buckets.items()}
+    
+    @staticmethod
+    def _index_entity_types(
+        rules_by_intent: Dict[Optional[IntentType], Tuple[DecisionRule, ...]]
+    ) -> Dict[Optional[IntentType], frozenset]:
+        """
+        Recense les types d'entités testés par les règles candidates de chaque type d'intention.
+        
+        Args:
+            rules_by_intent: Règles par type d'intention
+            
+        Returns:
+            Types d'entités par type d'intention (règles sans type incluses)
+        """
+        untyped = frozenset(
+            entity_type
+            for rule in rules_by_intent.get(None, ())
+            for entity_type in rule.condition.get("entities", {})
+        )
+        return {
+            intent_type: untyped.union(
+                entity_type
+                for rule in rules
+                for entity_type in rule.condition.get("entities", {})
+            )
+            for intent_type, rules in rules_by_intent.items()
+        }
+    
+    @staticmethod
+    def _index_rule_keywords(
+        rules: List[DecisionRule]
+    ) -> Dict[Tuple[str, Any], Tuple[DecisionRule, ...]]:
+        """
+        Construit l'index inversé (type d'entité, valeur attendue) -> règles.
+        
+        Args:
+            rules: Règles de décision
+            
+        Returns:
+            Règles attendant chaque valeur d'entité
+        """
+        index: Dict[Tuple[str, Any], List[DecisionRule]] = defaultdict(list)
+        for rule in rules:
+            for entity_type, expected_values in rule.condition.get("entities", {}).items():
+                for value in expected_values:
+                    index[(entity_type, value)].append(rule)
+        return {keyword: tuple(keyword_rules) for keyword, keyword_rules in index.items()}
+    
     def _initialize_factors(self) -> List[DecisionFactor]:
         """
         Initialise les facteurs de décision.
@@ -163,15 +304,20 @@ class DecisionEngine:
             Décision prise
         """
         # Vérification du cache
-        cache_key = self._get_decision_cache_key(intent, context)
-        if cache_key in self._decision_cache:
-            return self._decision_cache[cache_key]
-        
+        cache_key = (intent.type, intent.text, context.user_id, context.time_of_day)
+        cached_decision = self._decision_cache.get(cache_key)
+        if cached_decision is not None:
+            self._decision_cache.move_to_end(cache_key)
+            return cached_decision
+        
+        # Horloge lue une seule fois pour toute la prise de décision
+        now = datetime.now()
         try:
             # Tentative d'appel à l'API IA
-            decision_data = await self._call_decision_api(intent, context, available_actions)
+            decision_data = await self._call_decision_api(intent, context, available_actions, now)
             
-            # Création de la décision
+            # Création de la décision (horodatage du serveur, sinon instant courant)
+            timestamp = decision_data.get("timestamp")
             decision = Decision(
                 action=decision_data.get("action", "noop"),
                 target=decision_data.get("target", ""),
@@ -179,25 +325,55 @@ class DecisionEngine:
                 confidence=decision_data.get("confidence", 0.5),
                 reasoning=decision_data.get("reasoning", "No reasoning provided"),
                 alternatives=decision_data.get("alternatives", []),
-                timestamp=datetime.fromisoformat(decision_data.get("timestamp", datetime.now().isoformat()))
+                timestamp=datetime.fromisoformat(timestamp) if timestamp else now
             )
             
         except Exception as e:
-            self.logger.warning(f"API IA non disponible, utilisation des règles locales: {e}")
+            self.logger.warning("API IA non disponible, utilisation des règles locales: %s", e)
             # Utilisation des règles locales
-            decision = self._make_local_decision(intent, context, available_actions)
+            decision = self._make_local_decision(intent, context, available_actions, now)
         
         # Mise en cache
         self._decision_cache[cache_key] = decision
-        
-        self.logger.info(f"Décision prise: {decision.action} sur {decision.target} (confiance: {decision.confidence})")
+        if len(self._decision_cache) > self._CACHE_MAX:
+            self._decision_cache.popitem(last=False)
+        
+        self.logger.info(
+            "Décision prise: %s sur %s (confiance: %s)",
+            decision.action,
+            decision.target,
+            decision.confidence
+        )
         return decision
     
+    async def make_decisions_batch(
+        self,
+        pairs: List[Tuple[Intent, Context, List[Dict[str, Any]]]]
+    ) -> List[Decision]:
+        """
+        Prend plusieurs décisions indépendantes en parallèle.
+        
+        Args:
+            pairs: Triplets (intention, contexte, actions disponibles)
+            
+        Returns:
+            Décisions prises, dans l'ordre des triplets
+        """
+        # Borné par les connexions persistantes du client partagé
+        semaphore = asyncio.Semaphore(self._POOL_KEEPALIVE)
+        
+        async def decide(intent: Intent, context: Context, available_actions: List[Dict[str, Any]]) -> Decision:
+            async with semaphore:
+                return await self.make_decision(intent, context, available_actions)
+        
+        return list(await asyncio.gather(*(decide(*pair) for pair in pairs)))
+    
     async def _call_decision_api(
         self,
         intent: Intent,
         context: Context,
-        available_actions: List[Dict[str, Any]]
+        available_actions: List[Dict[str, Any]],
+        now: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Appelle l'API de prise de décision.
@@ -206,6 +382,7 @@ class DecisionEngine:
             intent: Intention utilisateur
             context: Contexte actuel
             available_actions: Actions disponibles
+            now: Horodatage de la requête (optionnel)
             
         Returns:
             Réponse de l'API
@@ -214,27 +391,29 @@ class DecisionEngine:
             "intent": intent.to_dict(),
             "context": context.to_dict(),
             "available_actions": available_actions,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
         
         try:
+            # Sérialisation en une passe (orjson si disponible), envoyée telle quelle
             response = await self.http_client.post(
-                f"{self.base_url}/api/decision",
-                json=payload,
-                headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+                self._decision_url,
+                content=_encode_payload(payload),
+                headers=self._request_headers
             )
             response.raise_for_status()
-            return response.json()
+            return _decode_response(response)
             
         except httpx.HTTPError as e:
-            self.logger.warning(f"API de décision non disponible: {e}")
+            self.logger.warning("API de décision non disponible: %s", e)
             raise
     
     def _make_local_decision(
         self,
         intent: Intent,
         context: Context,
-        available_actions: List[Dict[str, Any]]
+        available_actions: List[Dict[str, Any]],
+        now: Optional[datetime] = None
     ) -> Decision:
         """
         Prend une décision locale basée sur les règles.
@@ -243,34 +422,40 @@ class DecisionEngine:
             intent: Intention utilisateur
             context: Contexte actuel
             available_actions: Actions disponibles
+            now: Horodatage de la décision (optionnel)
             
         Returns:
             Décision locale
         """
+        now = now or datetime.now()
         # Évaluation des règles
         matching_rules = self._evaluate_rules(intent, context)
         
         if matching_rules:
-            # Sélection de la règle avec la priorité la plus élevée
-            best_rule = max(matching_rules, key=lambda r: (r.priority, r.confidence))
+            # Sélection de la règle avec la priorité la plus élevée (directe si unique)
+            single_match = len(matching_rules) == 1
+            if single_match:
+                best_rule = matching_rules[0]
+            else:
+                best_rule = max(matching_rules, key=lambda r: (r.priority, r.confidence))
             
             # Calcul de la confiance
             confidence = self._calculate_confidence(intent, context, best_rule)
             
             # Génération du raisonnement
-            reasoning = self._generate_reasoning(intent, context, best_rule)
+            reasoning = self._generate_reasoning(intent, context, best_rule, confidence)
             
-            # Génération des alternatives
-            alternatives = self._generate_alternatives(matching_rules, best_rule)
+            # Génération des alternatives (aucune si une seule règle correspond)
+            alternatives = [] if single_match else self._generate_alternatives(matching_rules, best_rule)
             
             return Decision(
                 action=best_rule.action,
                 target=best_rule.target,
-                parameters=best_rule.parameters,
+                parameters=dict(best_rule.parameters),
                 confidence=confidence,
                 reasoning=reasoning,
                 alternatives=alternatives,
-                timestamp=datetime.now()
+                timestamp=now
             )
         
         # Aucune règle correspondante
@@ -281,7 +466,7 @@ class DecisionEngine:
             confidence=0.1,
             reasoning="Aucune règle correspondante trouvée",
             alternatives=[],
-            timestamp=datetime.now()
+            timestamp=now
         )
     
     def _evaluate_rules(self, intent: Intent, context: Context) -> List[DecisionRule]:
@@ -297,38 +482,54 @@ class DecisionEngine:
         """
         matching_rules = []
         
-        for rule in self.rules:
-            if self._rule_matches(rule, intent, context):
+        # Une passe sur les valeurs d'entités de l'intention via l'index inversé :
+        # pour chaque règle, types d'entités dont une valeur attendue est présente
+        entities = intent.entities
+        entity_types = self._entity_types_by_intent.get(intent.type)
+        if entity_types is None:
+            entity_types = self._entity_types_by_intent.get(None, frozenset())
+        rules_by_keyword = self._rules_by_keyword
+        matched_entity_types: Dict[int, set] = defaultdict(set)
+        for entity_type in entity_types:
+            if entity_type not in entities:
+                continue
+            for value in self._as_entity_set(entities[entity_type]):
+                for rule in rules_by_keyword.get((entity_type, value), ()):
+                    matched_entity_types[id(rule)].add(entity_type)
+        
+        # Seules les règles du type de l'intention (et celles sans type) sont candidates
+        candidates = self._rules_by_intent.get(intent.type, ()) + self._rules_by_intent.get(None, ())
+        for rule in candidates:
+            if self._rule_matches(rule, intent, context, matched_entity_types.get(id(rule), ())):
                 matching_rules.append(rule)
         
         return matching_rules
     
-    def _rule_matches(self, rule: DecisionRule, intent: Intent, context: Context) -> bool:
+    def _rule_matches(
+        self,
+        rule: DecisionRule,
+        intent: Intent,
+        context: Context,
+        matched_entity_types: Collection[str]
+    ) -> bool:
         """
         Vérifie si une règle correspond à l'intention et au contexte.
         
+        Le type d'intention est déjà garanti par l'index de _evaluate_rules.
+        
         Args:
             rule: Règle à vérifier
             intent: Intention utilisateur
             context: Contexte actuel
+            matched_entity_types: Types d'entités satisfaits d'après l'index inversé
             
         Returns:
             True si la règle correspond
         """
-        # Vérification du type d'intention
-        if "intent_type" in rule.condition:
-            if intent.type != rule.condition["intent_type"]:
-                return False
-        
-        # Vérification des entités
+        # Vérification des entités : chaque type attendu doit avoir une valeur présente
         if "entities" in rule.condition:
-            for entity_type, expected_values in rule.condition["entities"].items():
-                if entity_type not in intent.entities:
-                    return False
-                
-                entity_values = intent.entities[entity_type]
-                if not any(value in entity_values for value in expected_values):
-                    return False
+            if len(matched_entity_types) < len(rule.condition["entities"]):
+                return False
         
         # Vérification du contexte
         if "context" in rule.condition:
@@ -339,6 +540,21 @@ class DecisionEngine:
         
         return True
     
+    @staticmethod
+    def _as_entity_set(values: Any) -> frozenset:
+        """
+        Convertit les valeurs d'une entité en ensemble.
+        
+        Args:
+            values: Valeur unique ou collection de valeurs
+            
+        Returns:
+            Ensemble des valeurs hachables
+        """
+        if isinstance(values, (str, int, float)):
+            return frozenset((values,))
+        return frozenset(value for value in values if value.__hash__ is not None)
+    
     def _calculate_confidence(
         self,
         intent: Intent,
@@ -356,34 +572,18 @@ class DecisionEngine:
         Returns:
             Niveau de confiance
         """
-        base_confidence = rule.confidence
-        
-        # Ajustement basé sur la confiance de l'intention
-        intent_factor = intent.confidence * 0.3
-        
-        # Ajustement basé sur le contexte
-        context_factor = self._calculate_context_factor(context) * 0.2
-        
-        # Ajustement basé sur l'heure
-        time_factor = self._calculate_time_factor(context) * 0.15
-        
-        # Ajustement basé sur les préférences utilisateur
-        preference_factor = self._calculate_preference_factor(context) * 0.2
-        
-        # Ajustement basé sur l'efficacité énergétique
-        energy_factor = self._calculate_energy_factor(intent, context) * 0.1
-        
-        # Ajustement basé sur la confidentialité
-        privacy_factor = self._calculate_privacy_factor(intent, context) * 0.05
-        
-        # Calcul final
-        confidence = base_confidence * (
-            intent_factor + context_factor + time_factor +
-            preference_factor + energy_factor + privacy_factor
+        # Valeurs des facteurs, dans l'ordre de decision_math.FACTOR_WEIGHTS
+        factor_values = (
+            intent.confidence,
+            self._calculate_context_factor(context),
+            self._calculate_time_factor(context),
+            self._calculate_preference_factor(context),
+            self._calculate_energy_factor(intent, context),
+            self._calculate_privacy_factor(intent, context)
         )
         
-        # Normalisation
-        return max(0.1, min(1.0, confidence))
+        # Produit scalaire poids x facteurs et normalisation
+        return decision_math.weighted_confidence(rule.confidence, factor_values)
     
     def _calculate_context_factor(self, context: Context) -> float:
         """
@@ -395,22 +595,12 @@ class DecisionEngine:
         Returns:
             Facteur de contexte
         """
-        # Plus le contexte est riche, plus le facteur est élevé
-        factor = 0.5
-        
-        if context.location:
-            factor += 0.1
-        
-        if context.weather:
-            factor += 0.1
-        
-        if context.device_states:
-            factor += 0.2
-        
-        if context.user_preferences:
-            factor += 0.1
-        
-        return min(1.0, factor)
+        return decision_math.context_factor(
+            bool(context.location),
+            bool(context.weather),
+            bool(context.device_states),
+            bool(context.user_preferences)
+        )
     
     def _calculate_time_factor(self, context: Context) -> float:
         """
@@ -422,18 +612,7 @@ class DecisionEngine:
         Returns:
             Facteur temporel
         """
-        if not context.time_of_day:
-            return 0.5
-        
-        # Certaines décisions sont plus appropriées à certains moments
-        time_factors = {
-            "morning": 0.8,
-            "afternoon": 0.9,
-            "evening": 0.7,
-            "night": 0.5
-        }
-        
-        return time_factors.get(context.time_of_day, 0.5)
+        return decision_math.time_factor(context.time_of_day)
     
     def _calculate_preference_factor(self, context: Context) -> float:
         """
@@ -445,15 +624,11 @@ class DecisionEngine:
         Returns:
             Facteur de préférences
         """
-        if not context.user_preferences:
-            return 0.5
-        
         # Vérification des préférences d'automatisation
-        auto_optimization = context.user_preferences.get("auto_optimization", False)
-        if auto_optimization:
-            return 0.9
-        
-        return 0.5
+        preferences = context.user_preferences
+        return decision_math.preference_factor(
+            bool(preferences) and bool(preferences.get("auto_optimization", False))
+        )
     
     def _calculate_energy_factor(self, intent: Intent, context: Context) -> float:
         """
@@ -466,14 +641,10 @@ class DecisionEngine:
         Returns:
             Facteur d'énergie
         """
-        # Les actions d'extinction sont plus efficaces énergétiquement
-        if intent.type == IntentType.CONTROL:
-            if "action" in intent.entities:
-                actions = intent.entities["action"]
-                if any(action in ["éteins", "désactive"] for action in actions):
-                    return 0.9
-        
-        return 0.5
+        return decision_math.energy_factor(
+            intent.type == IntentType.CONTROL,
+            intent.entities.get("action", ())
+        )
     
     def _calculate_privacy_factor(self, intent: Intent, context: Context) -> float:
         """
@@ -486,17 +657,14 @@ class DecisionEngine:
         Returns:
             Facteur de confidentialité
         """
-        # Les requêtes sont moins sensibles que les contrôles
-        if intent.type == IntentType.QUERY:
-            return 0.8
-        
-        return 0.5
+        return decision_math.privacy_factor(intent.type == IntentType.QUERY)
     
     def _generate_reasoning(
         self,
         intent: Intent,
         context: Context,
-        rule: DecisionRule
+        rule: DecisionRule,
+        confidence: float
     ) -> str:
         """
         Génère un raisonnement pour la décision.
@@ -505,27 +673,28 @@ class DecisionEngine:
             intent: Intention utilisateur
             context: Contexte actuel
             rule: Règle sélectionnée
+            confidence: Confiance déjà calculée pour cette règle
             
         Returns:
             Raisonnement
         """
-        reasoning_parts = []
+        time_of_day = context.time_of_day
+        location = context.location
         
         # Partie intention
-        reasoning_parts.append(f"Intention détectée: {intent.type.value}")
+        reasoning_parts = [f"Intention détectée: {intent.type.value}"]
         
         # Partie contexte
-        if context.time_of_day:
-            reasoning_parts.append(f"Moment de la journée: {context.time_of_day}")
+        if time_of_day:
+            reasoning_parts.append(f"Moment de la journée: {time_of_day}")
         
-        if context.location:
-            reasoning_parts.append(f"Localisation: {context.location}")
+        if location:
+            reasoning_parts.append(f"Localisation: {location}")
         
         # Partie règle
         reasoning_parts.append(f"Règle appliquée: {rule.action} sur {rule.target}")
         
         # Partie confiance
-        confidence = self._calculate_confidence(intent, context, rule)
         reasoning_parts.append(f"Confiance: {confidence:.2f}")
         
         return ". ".join(reasoning_parts)
@@ -533,7 +702,8 @@ class DecisionEngine:
     def _generate_alternatives(
         self,
         matching_rules: List[DecisionRule],
-        selected_rule: DecisionRule
+        selected_rule: DecisionRule,
+        max_alternatives: int = 3
     ) -> List[Dict[str, Any]]:
         """
         Génère des alternatives à la décision.
@@ -541,40 +711,40 @@ class DecisionEngine:
         Args:
             matching_rules: Règles correspondantes
             selected_rule: Règle sélectionnée
+            max_alternatives: Nombre maximal d'alternatives retournées
             
         Returns:
             Alternatives
         """
-        alternatives = []
+        return list(islice(self._iter_alternatives(matching_rules, selected_rule), max_alternatives))
+    
+    def _iter_alternatives(
+        self,
+        matching_rules: List[DecisionRule],
+        selected_rule: DecisionRule
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Produit paresseusement les alternatives à la décision.
         
+        Args:
+            matching_rules: Règles correspondantes
+            selected_rule: Règle sélectionnée
+            
+        Returns:
+            Itérateur d'alternatives
+        """
         for rule in matching_rules:
-            if rule == selected_rule:
+            # Comparaison d'identité : évite l'__eq__ champ par champ des dataclasses
+            if rule is selected_rule:
                 continue
             
-            alternatives.append({
+            yield {
                 "action": rule.action,
                 "target": rule.target,
-                "parameters": rule.parameters,
+                "parameters": dict(rule.parameters),
                 "confidence": rule.confidence * 0.8,  # Alternatives moins confiantes
                 "reasoning": f"Alternative: {rule.action} sur {rule.target}"
-            })
-        
-        return alternatives
-    
-    def _get_decision_cache_key(self, intent: Intent, context: Context) -> str:
-        """
-        Génère une clé de cache pour une décision.
-        
-        Args:
-            intent: Intention utilisateur
-            context: Contexte actuel
-            
-        Returns:
-            Clé de cache
-        """
-        intent_part = f"{intent.type.value}:{intent.text[:20]}"
-        context_part = f"{context.user_id}:{context.time_of_day}"
-        return f"decision:{intent_part}:{context_part}"
+            }
     
     async def evaluate_decision_quality(self, decision: Decision, outcome: Dict[str, Any]) -> float:
         """
@@ -605,9 +775,9 @@ class DecisionEngine:
             # Ajustement basé sur la confiance initiale
             adjusted_score = score * decision.confidence
             
-            self.logger.info(f"Qualité de décision évaluée: {adjusted_score:.2f}")
+            self.logger.info("Qualité de décision évaluée: %.2f", adjusted_score)
             return adjusted_score
             
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'évaluation de la qualité: {e}")
+            self.logger.error("Erreur lors de l'évaluation de la qualité: %s", e)
             return 0.5
@@ -7,15 +7,79 @@ les intentions et les entités pertinentes.
 
 import re
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from .ai_service import Intent, IntentType
 
 
+# Alias local : évite la résolution datetime.now à chaque parse
+_now = datetime.now
+
+
+def _build_keyword_matcher(
+    keyword_mapping: Dict[IntentType, List[str]]
+) -> Tuple[re.Pattern, Dict[str, frozenset], Dict[str, Tuple[IntentType, ...]]]:
+    """
+    Construit un reconnaisseur de mots-clés en une passe (équivalent Aho-Corasick).
+    
+    Les mots-clés sont essayés du plus long au plus court dans un lookahead :
+    à chaque position, le plus long mot-clé reconnu est retenu, et tous les
+    mots-clés qu'il contient (ex. « quel » dans « quelle ») s'en déduisent.
+    
+    Args:
+        keyword_mapping: Mots-clés par type d'intention
+        
+    Returns:
+        Tuple (regex, mots-clés contenus dans chaque mot-clé, types par mot-clé)
+    """
+    keyword_types: Dict[str, Tuple[IntentType, ...]] = {}
+    for intent_type, keywords in keyword_mapping.items():
+        for keyword in keywords:
+            keyword_types[keyword] = keyword_types.get(keyword, ()) + (intent_type,)
+    
+    keywords = sorted(keyword_types, key=len, reverse=True)
+    closure = {
+        keyword: frozenset(other for other in keywords if other in keyword)
+        for keyword in keywords
+    }
+    pattern = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in keywords) + "))")
+    return pattern, closure, keyword_types
+
+
 class IntentParser:
     """Parseur d'intentions."""
     
+    # Patterns communs compilés une seule fois ; le texte analysé est déjà en minuscules,
+    # les patterns sont donc écrits en minuscules et compilés sans re.IGNORECASE
+    _NUMERIC_RE = re.compile(r'\b\d+\b')
+    _UNITS_RE = re.compile(r'(pourcent|%|degrés|°c|°f|lux|hpa)')
+    
+    # Mots-clés indicatifs de chaque type d'intention
+    _KEYWORD_MAPPING: Dict[IntentType, List[str]] = {
+        IntentType.CONTROL: ["allume", "éteins", "active", "désactive", "mets", "change"],
+        IntentType.QUERY: ["combien", "quelle", "quel", "état", "statut", "valeur"],
+        IntentType.SCENE: ["scène", "mode", "ambiance", "atmosphère", "cinéma"],
+        IntentType.AUTOMATION: ["quand", "si", "automatise", "programme", "routine"],
+        IntentType.ROUTINE: ["routine", "habitude", "quotidien", "matin", "soir"],
+        IntentType.DIAGNOSTIC: ["problème", "erreur", "ne marche pas", "dysfonctionne"]
+    }
+    
+    # Automate de mots-clés construit une seule fois pour toutes les instances
+    _KEYWORD_RE, _KEYWORD_CLOSURE, _KEYWORD_TYPES = _build_keyword_matcher(_KEYWORD_MAPPING)
+    
+    # Clés du contexte reportées dans les entités lors de l'enrichissement
+    _CONTEXT_ENTITY_KEYS = (
+        ("user_id", "user"),
+        ("location", "location"),
+        ("preferences", "preferences")
+    )
+    
+    # Nombre de textes normalisés dont l'analyse est mémorisée
+    _PARSE_CACHE_SIZE = 1024
+    
     def __init__(self):
         """Initialise le parseur."""
         self.logger = logging.getLogger(__name__)
@@ -55,7 +119,7 @@ class IntentParser:
                 r"(augmente|diminue|monte|descends|règle|ajuste)"
             ],
             "value": [
-                r"(\d+)\s*(pourcent|%|degrés|°C|°F|lux|hPa)",
+                r"(\d+)\s*(pourcent|%|degrés|°c|°f|lux|hpa)",
                 r"(chaud|froid|clair|sombre|fort|faible|haut|bas)"
             ],
             "time": [
@@ -65,8 +129,52 @@ class IntentParser:
             ]
         }
         
+        # Compilation unique : une alternation par type (évite une recherche par pattern)
+        self._combined_patterns: Dict[IntentType, Tuple[re.Pattern, int]] = {
+            intent_type: (self._combine_patterns(patterns, lookahead=True)[0], len(patterns))
+            for intent_type, patterns in self.patterns.items()
+        }
+        self._combined_entity_patterns: Dict[str, Tuple[re.Pattern, List[Tuple[int, int]]]] = {
+            entity_type: self._combine_patterns(patterns)
+            for entity_type, patterns in self.entity_patterns.items()
+        }
+        
+        # Mémoïsation par instance de l'analyse (déterministe pour un texte normalisé)
+        self._parse_cached = lru_cache(maxsize=self._PARSE_CACHE_SIZE)(self._parse_normalized)
+        
         self.logger.info("IntentParser initialisé")
     
+    @staticmethod
+    def _combine_patterns(
+        patterns: List[str],
+        lookahead: bool = False
+    ) -> Tuple[re.Pattern, List[Tuple[int, int]]]:
+        """
+        Fusionne des patterns en une seule alternation compilée.
+        
+        Chaque pattern est encapsulé dans un groupe nommé « p<i> » : lastgroup
+        indique l'alternative reconnue. En mode lookahead, les correspondances
+        sont de largeur nulle et ne se masquent donc pas entre alternatives.
+        
+        Args:
+            patterns: Patterns à fusionner
+            lookahead: Encapsuler chaque alternative dans un lookahead
+            
+        Returns:
+            Tuple (regex combinée, (index du groupe nommé, nombre de groupes internes) par pattern)
+        """
+        alternatives = []
+        group_spans = []
+        group_index = 1
+        for i, pattern in enumerate(patterns):
+            assert pattern == pattern.lower(), f"Pattern non normalisé en minuscules: {pattern}"
+            alternative = f"(?P<p{i}>{pattern})"
+            alternatives.append(f"(?={alternative})" if lookahead else alternative)
+            inner_groups = re.compile(pattern).groups
+            group_spans.append((group_index, inner_groups))
+            group_index += 1 + inner_groups
+        return re.compile("|".join(alternatives)), group_spans
+    
     def parse(self, text: str, user_id: Optional[str] = None) -> Intent:
         """
         Parse un texte pour en extraire l'intention.
@@ -80,11 +188,9 @@ class IntentParser:
         """
         text_lower = text.lower().strip()
         
-        # Détection du type d'intention
-        intent_type, confidence = self._detect_intent_type(text_lower)
-        
-        # Extraction des entités
-        entities = self._extract_entities(text_lower)
+        # Analyse mémorisée, puis reconstruction des structures mutables
+        intent_type, confidence, frozen_entities = self._parse_cached(text_lower)
+        entities = {entity_type: list(values) for entity_type, values in frozen_entities}
         
         # Création de l'intention
         intent = Intent(
@@ -92,12 +198,35 @@ class IntentParser:
             text=text,
             confidence=confidence,
             entities=entities,
-            timestamp=datetime.now()
+            timestamp=_now()
         )
         
         self.logger.info(f"Intention parsée: {intent_type.value} (confiance: {confidence})")
         return intent
     
+    def _parse_normalized(
+        self,
+        text_lower: str
+    ) -> Tuple[IntentType, float, Tuple[Tuple[str, Tuple[Any, ...]], ...]]:
+        """
+        Analyse un texte normalisé et retourne un résultat immuable (mémorisable).
+        
+        Args:
+            text_lower: Texte en minuscules, sans espaces superflus
+            
+        Returns:
+            Tuple (type, confiance, entités sous forme de tuples)
+        """
+        # Détection du type d'intention
+        intent_type, confidence = self._detect_intent_type(text_lower)
+        
+        # Extraction des entités
+        entities = self._extract_entities(text_lower)
+        
+        return intent_type, confidence, tuple(
+            (entity_type, tuple(values)) for entity_type, values in entities.items()
+        )
+    
     def _detect_intent_type(self, text: str) -> tuple[IntentType, float]:
         """
         Détecte le type d'intention.
@@ -110,41 +239,44 @@ class IntentParser:
         """
         scores = {intent_type: 0.0 for intent_type in IntentType}
         
-        # Calcul des scores pour chaque type
-        for intent_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    scores[intent_type] += 0.3
-        
-        # Détection basée sur les mots-clés
-        keyword_mapping = {
-            IntentType.CONTROL: ["allume", "éteins", "active", "désactive", "mets", "change"],
-            IntentType.QUERY: ["combien", "quelle", "quel", "état", "statut", "valeur"],
-            IntentType.SCENE: ["scène", "mode", "ambiance", "atmosphère", "cinéma"],
-            IntentType.AUTOMATION: ["quand", "si", "automatise", "programme", "routine"],
-            IntentType.ROUTINE: ["routine", "habitude", "quotidien", "matin", "soir"],
-            IntentType.DIAGNOSTIC: ["problème", "erreur", "ne marche pas", "dysfonctionne"]
-        }
-        
-        for intent_type, keywords in keyword_mapping.items():
-            for keyword in keywords:
-                if keyword in text:
-                    scores[intent_type] += 0.2
-        
-        # Normalisation des scores
+        # Calcul des scores pour chaque type : +0.3 par pattern reconnu, en un seul parcours
+        for intent_type, (combined, pattern_count) in self._combined_patterns.items():
+            # Sortie immédiate pour les types sans aucune correspondance (cas le plus fréquent)
+            first_match = combined.search(text)
+            if first_match is None:
+                continue
+            
+            matched = {first_match.lastgroup}
+            for match in combined.finditer(text, first_match.start() + 1):
+                if len(matched) == pattern_count:
+                    break
+                matched.add(match.lastgroup)
+            scores[intent_type] += 0.3 * len(matched)
+        
+        # Détection basée sur les mots-clés : +0.2 par mot-clé présent, en une passe
+        found_keywords = set()
+        for match in self._KEYWORD_RE.finditer(text):
+            found_keywords |= self._KEYWORD_CLOSURE[match.group(1)]
+        
+        for keyword in found_keywords:
+            for intent_type in self._KEYWORD_TYPES[keyword]:
+                scores[intent_type] += 0.2
+        
+        # Aucun indice : inutile de normaliser, CONTROL par défaut
         total_score = sum(scores.values())
-        if total_score > 0:
-            for intent_type in scores:
-                scores[intent_type] /= total_score
+        if total_score <= 0:
+            return IntentType.CONTROL, 0.1
         
-        # Sélection du type avec le score le plus élevé
-        best_type = max(scores.items(), key=lambda x: x[1])
+        # Sélection du type avec le score le plus élevé ; la normalisation ne change pas
+        # l'argmax, seul le score retenu est divisé (1.0 si un seul type a été reconnu)
+        best_type, best_score = max(scores.items(), key=itemgetter(1))
+        confidence = best_score / total_score
         
         # Si aucun score significatif, retourner CONTROL par défaut
-        if best_type[1] < 0.1:
+        if confidence < 0.1:
             return IntentType.CONTROL, 0.1
         
-        return best_type
+        return best_type, confidence
     
     def _extract_entities(self, text: str) -> Dict[str, Any]:
         """
@@ -158,33 +290,42 @@ class IntentParser:
         """
         entities = {}
         
-        for entity_type, patterns in self.entity_patterns.items():
-            entity_values = []
+        # Un parcours par type : les types se chevauchent (« 21 degrés » est à la fois
+        # value, numeric et units), une regex maître unique imposerait des correspondances
+        # de largeur nulle et un dispatch Python par position, mesurés deux fois plus lents
+        for entity_type, (combined, group_spans) in self._combined_entity_patterns.items():
+            # Valeurs regroupées par pattern d'origine pour conserver l'ordre des patterns
+            values_by_pattern: List[List[str]] = [[] for _ in group_spans]
+            
+            for match in combined.finditer(text):
+                pattern_index = int(match.lastgroup[1:])
+                group_index, inner_groups = group_spans[pattern_index]
+                if inner_groups:
+                    # Prendre le premier groupe non vide du pattern reconnu
+                    groups = match.groups()[group_index:group_index + inner_groups]
+                    value = next((m for m in groups if m), "")
+                else:
+                    value = match.group(group_index)
+                values_by_pattern[pattern_index].append(value)
             
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    # Nettoyage des matches
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            # Prendre le premier groupe non vide
-                            value = next((m for m in match if m), "")
-                        else:
-                            value = match
-                        
-                        if value and value not in entity_values:
-                            entity_values.append(value)
+            entity_values = []
+            seen = set()
+            for values in values_by_pattern:
+                for value in values:
+                    if value and value not in seen:
+                        seen.add(value)
+                        entity_values.append(value)
             
             if entity_values:
                 entities[entity_type] = entity_values
         
         # Extraction des valeurs numériques
-        numeric_values = re.findall(r'\b\d+\b', text)
+        numeric_values = [int(match.group()) for match in self._NUMERIC_RE.finditer(text)]
         if numeric_values:
-            entities["numeric"] = [int(v) for v in numeric_values]
+            entities["numeric"] = numeric_values
         
         # Extraction des unités
-        units = re.findall(r'(pourcent|%|degrés|°C|°F|lux|hPa)', text, re.IGNORECASE)
+        units = self._UNITS_RE.findall(text)
         if units:
             entities["units"] = units
         
@@ -226,20 +367,19 @@ class IntentParser:
         Returns:
             Intention enrichie
         """
-        # Ajout d'informations de contexte aux entités
-        enriched_entities = intent.entities.copy()
-        
-        # Ajout du contexte utilisateur
-        if "user_id" in context:
-            enriched_entities["user"] = context["user_id"]
+        # Informations de contexte à ajouter aux entités (utilisateur, localisation, préférences)
+        overlay = {
+            entity_key: context[context_key]
+            for context_key, entity_key in self._CONTEXT_ENTITY_KEYS
+            if context_key in context
+        }
         
-        # Ajout de la localisation si disponible
-        if "location" in context:
-            enriched_entities["location"] = context["location"]
+        # Rien à ajouter : l'intention est retournée telle quelle, sans copie
+        if not overlay:
+            return intent
         
-        # Ajout des préférences utilisateur
-        if "preferences" in context:
-            enriched_entities["preferences"] = context["preferences"]
+        # Fusion en une seule opération C plutôt que copie + affectations successives
+        enriched_entities = {**intent.entities, **overlay}
         
         # Création d'une nouvelle intention enrichie
         enriched_intent = Intent(
@@ -9,6 +9,7 @@ from entities.models import (
     Device,
     State,
     BaseEntity,
+    CapabilityFlag,
     Service,
     Action,
     Prompt,
@@ -23,6 +24,7 @@ __all__ = [
     'Device',
     'State',
     'BaseEntity',
+    'CapabilityFlag',
     'Service',
     'Action',
     'Prompt',
@@ -11,13 +11,17 @@ Ce module définit les entités concrètes pour différents types de devices:
 - MediaPlayerEntity: média
 """
 
-from typing import Optional, Dict, Any, List
-from .base import BaseEntity, Device
+from typing import Optional, Dict, Any, Tuple
+from .base import BaseEntity, CapabilityFlag, Device
 
 
 class SensorEntity(BaseEntity):
     """Entité de type capteur."""
     
+    __slots__ = ('_device_class', 'unit_of_measurement', 'state_class')
+    
+    device_class = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -32,12 +36,19 @@ class SensorEntity(BaseEntity):
         self.unit_of_measurement = unit_of_measurement
         self.state_class = state_class
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du capteur."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["measure"]
         if self.device_class:
             caps.append(f"measure_{self.device_class}")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -53,6 +64,10 @@ class SensorEntity(BaseEntity):
 class BinarySensorEntity(BaseEntity):
     """Entité de type capteur binaire."""
     
+    __slots__ = ('_device_class',)
+    
+    device_class = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -63,12 +78,19 @@ class BinarySensorEntity(BaseEntity):
         super().__init__(entity_id, name, device, domain="binary_sensor")
         self.device_class = device_class
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du capteur binaire."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["binary_measure"]
         if self.device_class:
             caps.append(f"binary_{self.device_class}")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -82,6 +104,12 @@ class BinarySensorEntity(BaseEntity):
 class LightEntity(BaseEntity):
     """Entité de type lumière."""
     
+    __slots__ = ('_brightness', '_color_temp', '_rgb_color')
+    
+    brightness = CapabilityFlag()
+    color_temp = CapabilityFlag()
+    rgb_color = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -96,8 +124,15 @@ class LightEntity(BaseEntity):
         self.color_temp = color_temp
         self.rgb_color = rgb_color
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités de la lumière."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["turn_on", "turn_off"]
         if self.brightness:
             caps.append("brightness")
@@ -105,7 +140,7 @@ class LightEntity(BaseEntity):
             caps.append("color_temp")
         if self.rgb_color:
             caps.append("rgb_color")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -121,6 +156,10 @@ class LightEntity(BaseEntity):
 class SwitchEntity(BaseEntity):
     """Entité de type interrupteur."""
     
+    __slots__ = ()
+    
+    _CAPABILITIES = ("turn_on", "turn_off")
+    
     def __init__(
         self,
         entity_id: str,
@@ -129,14 +168,19 @@ class SwitchEntity(BaseEntity):
     ):
         super().__init__(entity_id, name, device, domain="switch")
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités de l'interrupteur."""
-        return ["turn_on", "turn_off"]
+        return self._CAPABILITIES
 
 
 class CoverEntity(BaseEntity):
     """Entité de type volet/rideau."""
     
+    __slots__ = ('_position', '_tilt')
+    
+    position = CapabilityFlag()
+    tilt = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -149,14 +193,21 @@ class CoverEntity(BaseEntity):
         self.position = position
         self.tilt = tilt
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du volet."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["open", "close", "stop"]
         if self.position:
             caps.append("set_position")
         if self.tilt:
             caps.append("tilt")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -171,6 +222,13 @@ class CoverEntity(BaseEntity):
 class ClimateEntity(BaseEntity):
     """Entité de type climatisation."""
     
+    __slots__ = ('_temperature', '_humidity', '_fan_mode', '_swing_mode')
+    
+    temperature = CapabilityFlag()
+    humidity = CapabilityFlag()
+    fan_mode = CapabilityFlag()
+    swing_mode = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -187,8 +245,15 @@ class ClimateEntity(BaseEntity):
         self.fan_mode = fan_mode
         self.swing_mode = swing_mode
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du climatiseur."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["set_temperature"] if self.temperature else []
         if self.humidity:
             caps.append("set_humidity")
@@ -196,7 +261,7 @@ class ClimateEntity(BaseEntity):
             caps.append("set_fan_mode")
         if self.swing_mode:
             caps.append("set_swing_mode")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -213,6 +278,12 @@ class ClimateEntity(BaseEntity):
 class MediaPlayerEntity(BaseEntity):
     """Entité de type lecteur média."""
     
+    __slots__ = ('_volume', '_source', '_media_content')
+    
+    volume = CapabilityFlag()
+    source = CapabilityFlag()
+    media_content = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -227,8 +298,15 @@ class MediaPlayerEntity(BaseEntity):
         self.source = source
         self.media_content = media_content
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du lecteur média."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["play", "pause", "stop", "next", "previous"]
         if self.volume:
             caps.append("volume_set")
@@ -236,7 +314,7 @@ class MediaPlayerEntity(BaseEntity):
             caps.append("select_source")
         if self.media_content:
             caps.append("play_media")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -7,14 +7,23 @@ Ce module combine:
 - DiscoveredDevice de ha_manager/models.py
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Dict, Any, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 import json
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur json
+    orjson = None
 
-@dataclass
+
+# Alias local : évite la résolution datetime.now à chaque horodatage
+_now = datetime.now
+
+
+@dataclass(slots=True)
 class Device:
     """Représente un device physique ou virtuel."""
     
@@ -25,21 +34,33 @@ class Device:
     capabilities: Dict[str, bool] = field(default_factory=dict)
     model: str = "unknown"
     manufacturer: str = "unknown"
-    last_seen: datetime = field(default_factory=datetime.now)
+    last_seen: datetime = field(default_factory=_now)
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit le device en dictionnaire."""
-        result = asdict(self)
-        result['last_seen'] = self.last_seen.isoformat()
-        return result
+        # Construction directe (asdict copie récursivement chaque champ) ;
+        # les dictionnaires sont copiés en surface pour rester indépendants du device
+        return {
+            'id': self.id,
+            'protocol': self.protocol,
+            'name': self.name,
+            'type': self.type,
+            'capabilities': dict(self.capabilities),
+            'model': self.model,
+            'manufacturer': self.manufacturer,
+            'last_seen': self.last_seen.isoformat(),
+            'metadata': dict(self.metadata)
+        }
     
     def to_json(self) -> str:
         """Convertit le device en JSON."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(self.to_dict())
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     """Device information for HA discovery (compatible avec Home Assistant)."""
     
@@ -76,7 +97,7 @@ class DeviceInfo:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceTopics:
     """MQTT topics pour un device."""
     
@@ -98,7 +119,7 @@ class DeviceTopics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveredDevice:
     """Un device découvert via MQTT."""
     
@@ -138,12 +159,12 @@ class DiscoveredDevice:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     """Représente l'état d'une entité."""
     
     value: Any
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: datetime = field(default_factory=_now)
     attributes: Dict[str, Any] = field(default_factory=dict)
     
     def to_dict(self) -> Dict[str, Any]:
@@ -155,9 +176,36 @@ class State:
         }
 
 
+class CapabilityFlag:
+    """
+    Option d'entité dont dépendent ses capacités.
+    
+    Les entités mémorisent le tuple retourné par get_capabilities ; toute
+    affectation d'une option (constructeur ou configuration ultérieure par
+    la factory) invalide ce tuple, recalculé au prochain appel. La valeur
+    est stockée dans l'attribut `_<nom>`, à déclarer dans __slots__.
+    """
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attr = f"_{name}"
+    
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self._attr)
+    
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self._attr, value)
+        obj._capabilities = None
+
+
 class BaseEntity(ABC):
     """Classe de base abstraite pour toutes les entités."""
     
+    # Instances nombreuses (une par entité du gateway) : pas de __dict__ par instance ;
+    # chaque sous-classe déclare à son tour ses propres __slots__
+    __slots__ = ('entity_id', 'name', 'device', 'state', 'domain', '_capabilities')
+    
     def __init__(
         self,
         entity_id: str,
@@ -171,13 +219,26 @@ class BaseEntity(ABC):
         self.device = device
         self.state = state
         self.domain = domain
+        # Tuple de capacités mémorisé par les sous-classes (invalidé par CapabilityFlag)
+        self._capabilities: Optional[Tuple[str, ...]] = None
     
     def update_state(self, value: Any, attributes: Optional[Dict[str, Any]] = None) -> None:
-        """Met à jour l'état de l'entité."""
-        self.state = State(
-            value=value,
-            attributes=attributes or {}
-        )
+        """
+        Met à jour l'état de l'entité.
+        
+        L'état existant est modifié sur place (pas d'allocation à chaque mise à jour) :
+        un appelant qui conserve un historique doit en copier les instantanés.
+        """
+        if self.state is None:
+            self.state = State(
+                value=value,
+                attributes=attributes or {}
+            )
+            return
+        
+        self.state.value = value
+        self.state.timestamp = _now()
+        self.state.attributes = attributes or {}
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -189,21 +250,22 @@ class BaseEntity(ABC):
             'state': self.state.to_dict() if self.state else None
         }
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités de l'entité."""
         # Implémentation par défaut qui peut être surchargée
         if self.device:
-            return list(self.device.capabilities.keys())
-        return []
+            return tuple(self.device.capabilities)
+        return ()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Service:
     """Représente un service disponible."""
     
     domain: str
     service: str
-    data: Dict[str, Any] = field(default_factory=dict)
+    # Dictionnaire non hachable : exclu du hash (toujours comparé par __eq__)
+    data: Dict[str, Any] = field(default_factory=dict, hash=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit le service en dictionnaire."""
@@ -227,7 +289,7 @@ class Action(ABC):
         self.name = name
         self.target = target
         self.parameters = parameters or {}
-        self.timestamp = timestamp or datetime.now()
+        self.timestamp = timestamp or _now()
     
     @abstractmethod
     def execute(self) -> Dict[str, Any]:
@@ -244,7 +306,7 @@ class Action(ABC):
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Prompt:
     """Prompt abstrait pour l'IA."""
     
@@ -270,7 +332,7 @@ class Prompt:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EntityPrompt(Prompt):
     """Prompt qui inclut une entité JSON sérialisable."""
     
@@ -287,7 +349,8 @@ class EntityPrompt(Prompt):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit le prompt en dictionnaire."""
-        base = super().to_dict()
+        # Appel explicite : super() sans argument ne fonctionne pas avec slots=True
+        base = Prompt.to_dict(self)
         base.update({
             'entity_data': self.entity_data
         })
@@ -7,13 +7,17 @@ Ce module définit les entités liées au protocole MQTT:
 - MQTTTopicEntity: entité basée sur un topic MQTT
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Tuple
 from .base import BaseEntity, Device
 
 
 class MQTTEntity(BaseEntity):
     """Entité générique MQTT."""
     
+    __slots__ = ('topic', 'qos', 'retain')
+    
+    _CAPABILITIES = ("publish", "subscribe")
+    
     def __init__(
         self,
         entity_id: str,
@@ -28,9 +32,9 @@ class MQTTEntity(BaseEntity):
         self.qos = qos
         self.retain = retain
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités MQTT."""
-        return ["publish", "subscribe"]
+        return self._CAPABILITIES
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -46,6 +50,8 @@ class MQTTEntity(BaseEntity):
 class MQTTDeviceEntity(MQTTEntity):
     """Entité MQTT avec device associé."""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         entity_id: str,
@@ -58,17 +64,21 @@ class MQTTDeviceEntity(MQTTEntity):
         super().__init__(entity_id, name, topic, device, qos, retain)
         self.domain = f"mqtt_{device.type}"
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du device MQTT."""
-        caps = super().get_capabilities()
+        # Non mémorisé : le device et son dictionnaire de capacités restent modifiables
         if self.device:
-            caps.extend(self.device.capabilities.keys())
-        return caps
+            return self._CAPABILITIES + tuple(self.device.capabilities)
+        return self._CAPABILITIES
 
 
 class MQTTTopicEntity(BaseEntity):
     """Entité basée sur un topic MQTT."""
     
+    __slots__ = ('topic_pattern', 'value_template')
+    
+    _CAPABILITIES = ("pattern_match", "template_processing")
+    
     def __init__(
         self,
         entity_id: str,
@@ -81,9 +91,9 @@ class MQTTTopicEntity(BaseEntity):
         self.topic_pattern = topic_pattern
         self.value_template = value_template
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du topic MQTT."""
-        return ["pattern_match", "template_processing"]
+        return self._CAPABILITIES
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -5,15 +5,21 @@ Ce module définit TopicEntity, une entité spécialisée pour la gestion
 de topics MQTT avec support de patterns, wildcards et transformations.
 """
 
-from typing import Optional, Dict, Any, List, Pattern
+from typing import Optional, Dict, Any, Pattern, Tuple
 import os
 import re
-from .base import BaseEntity, Device
+from .base import BaseEntity, CapabilityFlag, Device
 
 
 class TopicEntity(BaseEntity):
     """Entité spécialisée pour les topics MQTT avec patterns."""
     
+    __slots__ = ('topic_pattern', '_value_template', '_wildcard', '_multi_level', '_compiled_pattern')
+    
+    value_template = CapabilityFlag()
+    wildcard = CapabilityFlag()
+    multi_level = CapabilityFlag()
+    
     def __init__(
         self,
         entity_id: str,
@@ -121,8 +127,15 @@ class TopicEntity(BaseEntity):
         
         return result
     
-    def get_capabilities(self) -> List[str]:
+    def get_capabilities(self) -> Tuple[str, ...]:
         """Retourne les capacités du topic."""
+        caps = self._capabilities
+        if caps is None:
+            caps = self._capabilities = self._build_capabilities()
+        return caps
+    
+    def _build_capabilities(self) -> Tuple[str, ...]:
+        """Calcule les capacités à partir des options courantes."""
         caps = ["topic_matching"]
         if self.wildcard:
             caps.append("wildcard_matching")
@@ -130,7 +143,7 @@ class TopicEntity(BaseEntity):
             caps.append(os.getenv('TOPIC_MULTI_LEVEL_MATCHING', 'multi_level_matching'))
         if self.value_template:
             caps.append("value_processing")
-        return caps
+        return tuple(caps)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'entité en dictionnaire."""
@@ -6,12 +6,44 @@ utilisant aiomqtt avec support du pattern Observer.
 """
 
 import asyncio
+import inspect
 import os
 import json
-from typing import Dict, Any, List, Optional, Callable, Union, Awaitable
+from typing import Dict, Any, List, Optional, Callable, Union, Awaitable, Tuple
 import aiomqtt
 from .base import Protocol, ProtocolObserver, ProtocolState, ProtocolMessage
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur json
+    orjson = None
+
+
+# Port par défaut du broker, lu une seule fois dans l'environnement
+_DEFAULT_MQTT_PORT = int(os.getenv('MQTT_PORT', '1883'))
+
+
+def _encode_json(payload: Union[Dict[str, Any], List[Any]]) -> Union[bytes, str]:
+    """Sérialise un payload JSON (octets directement avec orjson si disponible)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload)
+
+
+def _decode_payload(raw: bytes) -> Any:
+    """Décode un payload MQTT : JSON si possible, sinon texte UTF-8."""
+    try:
+        if orjson is not None:
+            # orjson lit directement les octets, sans décodage intermédiaire
+            return orjson.loads(raw)
+        return json.loads(raw.decode())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return raw.decode()
+
+
+# Marqueur d'un payload pas encore décodé depuis ses octets bruts
+_UNDECODED = object()
+
 
 class MQTTMessage(ProtocolMessage):
     """Message MQTT spécialisé."""
@@ -19,24 +51,33 @@ class MQTTMessage(ProtocolMessage):
     def __init__(
         self,
         topic: str,
-        payload: Any,
+        payload: Any = _UNDECODED,
         qos: int = 0,
         retain: bool = False,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        raw: Optional[bytes] = None
     ):
+        # Octets reçus, conservés tels quels pour pouvoir être republiés sans réencodage
+        self.raw = raw
         super().__init__(topic, payload, qos=qos, retain=retain, metadata=metadata or {})
     
+    @property
+    def payload(self) -> Any:
+        """Payload décodé (JSON ou texte), calculé au premier accès seulement."""
+        if self._payload is _UNDECODED:
+            self._payload = _decode_payload(self.raw)
+        return self._payload
+    
+    @payload.setter
+    def payload(self, value: Any) -> None:
+        self._payload = value
+    
     @classmethod
     def from_aiomqtt(cls, message: aiomqtt.Message) -> 'MQTTMessage':
         """Crée un MQTTMessage à partir d'un message aiomqtt."""
-        try:
-            payload = json.loads(message.payload.decode())
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            payload = message.payload.decode()
-        
         return cls(
             topic=str(message.topic),
-            payload=payload,
+            raw=message.payload,
             qos=message.qos,
             retain=message.retain,
             metadata={
@@ -52,7 +93,7 @@ class MQTTClient:
     def __init__(
         self,
         host: str = "localhost",
-        port: int = int(os.getenv('MQTT_PORT', '1883')),
+        port: int = _DEFAULT_MQTT_PORT,
         username: Optional[str] = None,
         password: Optional[str] = None,
         client_id: Optional[str] = None,
@@ -114,17 +155,56 @@ class MQTTClient:
             return False
         
         try:
+            # Octets déjà sérialisés (ex. MQTTMessage.raw) : transmis sans réencodage
+            if isinstance(payload, (bytes, bytearray)):
+                await self._client.publish(topic, bytes(payload), qos=qos, retain=retain)
+                return True
+            
             if isinstance(payload, (dict, list)):
-                payload_str = json.dumps(payload)
+                payload_data = _encode_json(payload)
             else:
-                payload_str = str(payload)
+                payload_data = str(payload)
             
-            await self._client.publish(topic, payload_str, qos=qos, retain=retain)
+            await self._client.publish(topic, payload_data, qos=qos, retain=retain)
             return True
         except Exception as e:
             print(f"Erreur de publication MQTT: {e}")
             return False
     
+    async def publish_many(self, messages: List[Tuple[str, Any, int, bool]]) -> List[bool]:
+        """
+        Publie un lot de messages MQTT en parallèle.
+        
+        Args:
+            messages: Tuples (topic, payload, qos, retain)
+            
+        Returns:
+            Résultat de publication de chaque message, dans l'ordre du lot
+        """
+        if not self._connected or not self._client:
+            return [False] * len(messages)
+        
+        # Sérialisation en amont : chaque tâche n'a plus qu'à écrire sur le socket
+        encoded = [
+            (topic, self._preencode(payload), qos, retain)
+            for topic, payload, qos, retain in messages
+        ]
+        results = await asyncio.gather(
+            *(self.publish(topic, payload, qos, retain) for topic, payload, qos, retain in encoded),
+            return_exceptions=True
+        )
+        return [result is True for result in results]
+    
+    @staticmethod
+    def _preencode(payload: Any) -> Any:
+        """Sérialise un payload dict/list ; en cas d'échec, publish() rapportera l'erreur."""
+        if not isinstance(payload, (dict, list)):
+            return payload
+        try:
+            return _encode_json(payload)
+        except (TypeError, ValueError):
+            return payload
+    
     async def subscribe(self, topic: str, qos: int = 0) -> bool:
         """S'abonne à un topic MQTT."""
         if not self._connected or not self._client:
@@ -156,12 +236,20 @@ class MQTTClient:
         if not self._connected or not self._client:
             return
         
-        async for message in self._client.messages:
-            mqtt_message = MQTTMessage.from_aiomqtt(message)
-            # Si le callback est async, on l'attend
-            result = callback(mqtt_message)
-            if asyncio.iscoroutine(result):
-                await result
+        # Nature du callback déterminée une seule fois, pas à chaque message
+        is_async = inspect.iscoroutinefunction(callback) or inspect.iscoroutinefunction(
+            getattr(callback, "__call__", None)
+        )
+        
+        if is_async:
+            async for message in self._client.messages:
+                await callback(MQTTMessage.from_aiomqtt(message))
+        else:
+            async for message in self._client.messages:
+                result = callback(MQTTMessage.from_aiomqtt(message))
+                # Fonction ordinaire renvoyant une coroutine (lambda, partial...)
+                if inspect.isawaitable(result):
+                    await result
 
 
 class MQTTProtocol(Protocol):
@@ -170,7 +258,7 @@ class MQTTProtocol(Protocol):
     def __init__(
         self,
         host: str = "localhost",
-        port: int = int(os.getenv('MQTT_PORT', '1883')),
+        port: int = _DEFAULT_MQTT_PORT,
         username: Optional[str] = None,
         password: Optional[str] = None,
         client_id: Optional[str] = None,
@@ -245,6 +333,13 @@ class MQTTProtocol(Protocol):
         
         return await self._client.publish(topic, payload, qos, retain)
     
+    async def publish_many(self, messages: List[Tuple[str, Any, int, bool]]) -> List[bool]:
+        """Publie un lot de messages MQTT en parallèle (ex. rafale de découverte)."""
+        if not self._client:
+            return [False] * len(messages)
+        
+        return await self._client.publish_many(messages)
+    
     async def subscribe(self, topic: str, qos: int = 0) -> bool:
         """S'abonne à un topic MQTT."""
         if not self._client:
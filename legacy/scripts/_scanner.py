@@ -0,0 +1,165 @@
+"""
+Parcours et analyse partagés par find_hardcoded.py et replace_hardcoded.py :
+chaque fichier Python est lu une seule fois et son contenu n'est traité que
+par le processus qui l'a lu ; seul le résultat de ce traitement est rendu.
+"""
+
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Set, Iterator
+
+# En dessous de ce nombre de fichiers, le coût de démarrage des processus l'emporte
+_PARALLEL_MIN_FILES = 64
+
+# Répertoires jamais parcourus (comparés au nom de composant)
+EXCLUDED_DIRS = frozenset({'__pycache__', '.git', 'venv', 'env', '.venv', 'node_modules'})
+
+# Valeurs communes jamais signalées
+_EXCLUDED_VALUES = frozenset({'True', 'False', 'None', 'self', '', '0', '1', '127.0.0.1', 'localhost'})
+
+# (ligne, variable, valeur, type)
+Finding = Tuple[int, str, str, str]
+
+# Traitement d'un fichier analysé : (chemin, contenu, détections) -> résultat picklable
+FileHandler = Callable[[str, bytes, List[Finding]], Any]
+
+def constant_assignments(source, filename: str = "<unknown>") -> List[Finding]:
+    """Parcourt les affectations `NOM = constante` tenant sur une ligne : (ligne, variable, valeur, type)"""
+    assignments = []
+    # L'AST ignore d'office commentaires et contenu des chaînes
+    for node in ast.walk(ast.parse(source, filename=filename)):
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant)
+                and node.lineno == node.end_lineno):
+            continue
+        
+        value = node.value.value
+        if isinstance(value, str):
+            var_value, var_type = value, 'string'
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        elif isinstance(value, int) and 0 <= value <= 99999:
+            var_value, var_type = str(value), 'port'
+        else:
+            var_value, var_type = str(value), 'number'
+        assignments.append((node.lineno, node.targets[0].id, var_value, var_type))
+    
+    # ast.walk parcourt en largeur : retour dans l'ordre du fichier
+    assignments.sort()
+    return assignments
+
+def hardcoded_assignments(source, filename: str = "<unknown>") -> List[Finding]:
+    """Filtre les affectations candidates à une variable d'environnement (SyntaxError si invalide)"""
+    findings = []
+    for finding in constant_assignments(source, filename):
+        _, var_name, var_value, _ = finding
+        
+        # Exclure certaines valeurs communes
+        if var_value in _EXCLUDED_VALUES:
+            continue
+        
+        # Exclure les noms de variables courts
+        if len(var_name) < 3:
+            continue
+        
+        # Vérifier si c'est une variable d'environnement potentielle
+        if var_name.isupper() or '_' in var_name:
+            findings.append(finding)
+    
+    return findings
+
+def iter_py_files(root_dir: str, excluded_dirs: Set[str] = EXCLUDED_DIRS) -> Iterator[str]:
+    """Parcourt l'arborescence avec os.scandir en élaguant les répertoires exclus avant d'y descendre"""
+    stack = [root_dir]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded_dirs:
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.py') and entry.is_file():
+                        yield str(Path(entry.path))
+        except OSError as e:
+            print(f"⚠️  Erreur lors du parcours de {directory}: {e}")
+
+def scan_file(file_path: str) -> Tuple[bytes, List[Finding]]:
+    """Lit un fichier une seule fois et détecte ses valeurs hardcodées (OSError/SyntaxError propagées)"""
+    # ast.parse lit directement les octets (cookie d'encodage compris)
+    data = Path(file_path).read_bytes()
+    return data, hardcoded_assignments(data, file_path)
+
+def _scan_one_file(file_path: str, handler: FileHandler) -> Tuple[str, Any, Optional[str]]:
+    """Analyse puis traite un fichier dans un sous-processus ; l'erreur éventuelle est renvoyée pour être affichée dans l'ordre"""
+    try:
+        data, findings = scan_file(file_path)
+    except Exception as e:
+        return file_path, None, str(e)
+    # Le contenu ne quitte pas le processus qui l'a lu : seul le résultat repasse au parent
+    return file_path, handler(file_path, data, findings), None
+
+def map_tree(handler: FileHandler, root_dir: str = ".", excluded_dirs: Set[str] = EXCLUDED_DIRS) -> Iterator[Tuple[str, Any]]:
+    """Produit (chemin, résultat du traitement) pour chaque fichier Python lisible, dans l'ordre du parcours"""
+    files = list(iter_py_files(root_dir, excluded_dirs))
+    # Le traitement doit être picklable (fonction de module, éventuellement partielle)
+    worker = partial(_scan_one_file, handler=handler)
+    
+    # Fichiers indépendants : analyse et traitement répartis sur plusieurs processus pour les grands arbres
+    if len(files) < _PARALLEL_MIN_FILES:
+        yield from _iter_results(map(worker, files))
+    else:
+        with ProcessPoolExecutor() as executor:
+            yield from _iter_results(executor.map(worker, files, chunksize=32))
+
+def _iter_results(results) -> Iterator[Tuple[str, Any]]:
+    """Affiche les erreurs de lecture et ne produit que les fichiers analysés"""
+    for file_path, result, error in results:
+        if error is not None:
+            print(f"⚠️  Erreur lors de la lecture de {file_path}: {error}")
+            continue
+        yield file_path, result
+
+def _flagged_lines(file_path: str, data: bytes, findings: List[Finding]) -> Tuple[List[Finding], List[bytes]]:
+    """Détections et lignes brutes correspondantes (pas le contenu entier)"""
+    lines = data.split(b'\n') if findings else []
+    return findings, [lines[lineno - 1] for lineno, *_ in findings]
+
+def scan_tree(root_dir: str = ".", excluded_dirs: Set[str] = EXCLUDED_DIRS) -> Iterator[Tuple[str, List[Finding], List[bytes]]]:
+    """Produit (chemin, détections, lignes brutes des détections) pour chaque fichier Python lisible, dans l'ordre du parcours"""
+    for file_path, (findings, lines) in map_tree(_flagged_lines, root_dir, excluded_dirs):
+        yield file_path, findings, lines
+
+@lru_cache(maxsize=4)
+def _parse_env_file(env_file: str, mtime_ns: int) -> Dict[str, str]:
+    """Analyse le fichier .env (mémorisé tant que sa date de modification est inchangée)"""
+    env_vars = {}
+    with open(env_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                parts = line.split('=', 1)
+                var_name = parts[0].strip()
+                var_value = parts[1].strip() if len(parts) > 1 else ''
+                env_vars[var_name] = var_value
+    
+    return env_vars
+
+def load_env_vars(env_file: str = ".env", report_count: bool = False) -> Dict[str, str]:
+    """Charge les variables d'environnement depuis le fichier .env"""
+    try:
+        mtime_ns = os.stat(env_file).st_mtime_ns
+    except FileNotFoundError:
+        print(f"⚠️  Fichier {env_file} non trouvé")
+        return {}
+    
+    # Copie : l'appelant peut modifier le dictionnaire sans altérer le cache
+    env_vars = dict(_parse_env_file(env_file, mtime_ns))
+    
+    if report_count:
+        print(f"✅ {len(env_vars)} variables chargées depuis {env_file}")
+    return env_vars
@@ -4,123 +4,105 @@ Script pour remplacer les variables hardcodées par des appels à os.getenv()
 avec des valeurs par défaut appropriées.
 """
 
-import os
-import re
-import sys
+from contextlib import redirect_stdout
+from functools import partial
+from io import StringIO
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple
 
-def load_env_vars(env_file: str = ".env") -> Dict[str, str]:
-    """Charge les variables d'environnement depuis le fichier .env"""
-    env_vars = {}
-    if not os.path.exists(env_file):
-        print(f"⚠️  Fichier {env_file} non trouvé")
-        return env_vars
-    
-    with open(env_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                parts = line.split('=', 1)
-                var_name = parts[0].strip()
-                var_value = parts[1].strip() if len(parts) > 1 else ''
-                env_vars[var_name] = var_value
-    
-    return env_vars
+from _scanner import EXCLUDED_DIRS, hardcoded_assignments, load_env_vars, map_tree, scan_file
+
+# Variables de statut/état
+_STATUS_VARS = frozenset({'CONNECTED', 'CONNECTING', 'DISCONNECTED', 'ERROR', 'RECONNECTING'})
+# Variables de type d'intention
+_INTENT_VARS = frozenset({'AUTOMATION', 'CONTROL', 'DIAGNOSTIC', 'QUERY', 'ROUTINE', 'SCENE'})
+# Variables de configuration
+_CONFIG_VARS = frozenset({'MQTT_BROKER', 'HA_TOKEN', 'HA_URL', 'REDIS_HOST', 'REDIS_PORT'})
+# Variables dont la valeur par défaut est toujours une chaîne (une seule recherche)
+_QUOTED_VARS = _STATUS_VARS | _INTENT_VARS | _CONFIG_VARS
+_NUMERIC_TYPES = frozenset({'number', 'port'})
+
+def find_hardcoded_lines_from_text(content: str, file_path: str = "<unknown>") -> List[Tuple[int, str, str, str]]:
+    """Trouve les lignes avec des variables hardcodées dans un contenu déjà lu (SyntaxError si invalide)"""
+    lines = content.split('\n')
+    return [
+        (i, var_name, var_value, lines[i - 1].rstrip())
+        for i, var_name, var_value, _ in hardcoded_assignments(content, file_path)
+    ]
 
 def find_hardcoded_lines(file_path: str) -> List[Tuple[int, str, str, str]]:
     """Trouve les lignes avec des variables hardcodées dans un fichier"""
-    hardcoded_lines = []
-    
-    patterns = [
-        (r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"([^"]+)"', 'string'),
-        (r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*\'([^\']+)\'', 'string'),
-        (r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([0-9]+)', 'number'),
-        (r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})', 'ip'),
-        (r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([0-9]{1,5})', 'port'),
-    ]
-    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        for i, line in enumerate(lines, 1):
-            # Ignorer les lignes avec os.getenv ou os.environ.get
-            if 'os.getenv' in line or 'os.environ.get' in line:
-                continue
-            
-            # Ignorer les commentaires
-            if line.strip().startswith('#'):
-                continue
-            
-            for pattern, var_type in patterns:
-                matches = re.findall(pattern, line)
-                for match in matches:
-                    var_name = match[0]
-                    var_value = match[1]
-                    
-                    # Exclure certaines valeurs communes
-                    if var_value in ['True', 'False', 'None', 'self', '', '0', '1', '127.0.0.1', 'localhost']:
-                        continue
-                    
-                    # Exclure les noms de variables courts
-                    if len(var_name) < 3:
-                        continue
-                    
-                    # Vérifier si c'est une variable d'environnement potentielle
-                    if var_name.isupper() or '_' in var_name:
-                        hardcoded_lines.append((i, var_name, var_value, line.rstrip()))
-    
+        content = Path(file_path).read_text(encoding='utf-8')
+        return find_hardcoded_lines_from_text(content, file_path)
     except Exception as e:
         print(f"⚠️  Erreur lors de la lecture de {file_path}: {e}")
-    
-    return hardcoded_lines
+        return []
+
+def _string_literal(value: str) -> str:
+    """Littéral Python de la valeur décodée, entre guillemets doubles si possible (échappements conservés)"""
+    literal = repr(value)
+    # repr n'utilise des apostrophes avec « \' » échappés que si la valeur contient aussi des guillemets
+    if literal[0] == "'" and '"' not in value:
+        literal = f'"{literal[1:-1]}"'
+    return literal
 
 def determine_default_value(var_name: str, current_value: str, var_type: str) -> str:
     """Détermine la valeur par défaut appropriée pour une variable"""
-    # Variables de statut/état
-    status_vars = {'CONNECTED', 'CONNECTING', 'DISCONNECTED', 'ERROR', 'RECONNECTING'}
-    if var_name in status_vars:
-        return f'"{current_value}"'
-    
-    # Variables de type d'intention
-    intent_vars = {'AUTOMATION', 'CONTROL', 'DIAGNOSTIC', 'QUERY', 'ROUTINE', 'SCENE'}
-    if var_name in intent_vars:
-        return f'"{current_value}"'
-    
-    # Variables de configuration
-    config_vars = {'MQTT_BROKER', 'HA_TOKEN', 'HA_URL', 'REDIS_HOST', 'REDIS_PORT'}
-    if var_name in config_vars:
-        return f'"{current_value}"'
+    # Variables de statut/état, d'intention ou de configuration : toujours des chaînes
+    if var_name in _QUOTED_VARS:
+        return _string_literal(current_value)
     
     # Variables numériques
-    if var_type in ['number', 'port']:
+    if var_type in _NUMERIC_TYPES:
         return current_value
     
     # Variables de chaîne
     if var_type == 'string':
-        return f'"{current_value}"'
+        return _string_literal(current_value)
     
     # Par défaut, utiliser la valeur actuelle comme chaîne
-    return f'"{current_value}"'
+    return _string_literal(current_value)
+
+def _decode_source(data: bytes) -> str:
+    """Décode un fichier comme read_text : UTF-8 et fins de ligne universelles"""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
 
 def replace_hardcoded_in_file(file_path: str, env_vars: Dict[str, str]) -> int:
     """Remplace les variables hardcodées dans un fichier"""
-    hardcoded_lines = find_hardcoded_lines(file_path)
+    try:
+        data, findings = scan_file(file_path)
+    except Exception as e:
+        print(f"⚠️  Erreur lors de la lecture de {file_path}: {e}")
+        return 0
+    
+    return _replace_in_content(file_path, data, findings, env_vars)
+
+def _replace_in_content(file_path: str, data: bytes, findings, env_vars: Dict[str, str]) -> int:
+    """Remplace les variables hardcodées à partir du contenu et des détections déjà calculés"""
+    if not findings:
+        return 0
     
-    if not hardcoded_lines:
+    # Lecture unique : le contenu déjà lu sert au remplacement
+    try:
+        content = _decode_source(data)
+    except Exception as e:
+        print(f"⚠️  Erreur lors de la lecture de {file_path}: {e}")
         return 0
     
+    lines = content.split('\n')
+    hardcoded_lines = [
+        (i, var_name, var_value, lines[i - 1].rstrip())
+        for i, var_name, var_value, _ in findings
+    ]
+    
     print(f"\n📝 Traitement de {file_path}:")
     print(f"   • {len(hardcoded_lines)} variables hardcodées trouvées")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         replacements = 0
-        new_content = content
-        
+        # Remplacement par numéro de ligne en un seul passage sur le contenu
+        # (plus de re.sub sur tout le fichier pour chaque ligne)
         for line_num, var_name, current_value, original_line in hardcoded_lines:
             # Vérifier si la variable est déjà dans .env
             if var_name in env_vars:
@@ -129,19 +111,22 @@ def replace_hardcoded_in_file(file_path: str, env_vars: Dict[str, str]) -> int:
                 if default_value.isdigit():
                     replacement = f'{var_name} = os.getenv("{var_name}", {default_value})'
                 else:
-                    replacement = f'{var_name} = os.getenv("{var_name}", "{default_value}")'
+                    replacement = f'{var_name} = os.getenv("{var_name}", {_string_literal(default_value)})'
             else:
                 # Utiliser la valeur hardcodée comme valeur par défaut
                 default_value = determine_default_value(var_name, current_value, 'string')
                 replacement = f'{var_name} = os.getenv("{var_name}", {default_value})'
             
-            # Remplacer la ligne
-            pattern = re.escape(original_line)
-            new_content = re.sub(pattern, replacement, new_content, count=1)
+            # Remplacer la ligne en conservant son indentation et ses espaces finaux
+            line = lines[line_num - 1]
+            indent = line[:len(line) - len(line.lstrip())]
+            lines[line_num - 1] = indent + replacement + line[len(original_line):]
             replacements += 1
             
             print(f"   • Ligne {line_num}: {var_name} = {current_value} → {replacement}")
         
+        new_content = '\n'.join(lines)
+        
         # Ajouter l'import os si nécessaire
         if replacements > 0 and 'import os' not in new_content:
             # Trouver la première ligne d'import
@@ -153,8 +138,7 @@ def replace_hardcoded_in_file(file_path: str, env_vars: Dict[str, str]) -> int:
             else:
                 # Ajouter au début du fichier
                 lines.insert(0, 'import os')
-new_content = os.getenv("new_content", "
-")
+            new_content = '\n'.join(lines)
         
         # Écrire le fichier modifié
         if replacements > 0:
@@ -168,6 +152,13 @@ new_content = os.getenv("new_content", "
         print(f"   ❌ Erreur lors du traitement: {e}")
         return 0
 
+def _rewrite_scanned(file_path: str, data: bytes, findings, env_vars: Dict[str, str]) -> Tuple[int, str]:
+    """Réécrit un fichier analysé (éventuellement dans un sous-processus) et retourne sa sortie pour l'afficher dans l'ordre"""
+    output = StringIO()
+    with redirect_stdout(output):
+        replacements = _replace_in_content(file_path, data, findings, env_vars)
+    return replacements, output.getvalue()
+
 def process_directory(root_dir: str = ".", env_vars: Dict[str, str] = None) -> Dict[str, int]:
     """Traite tous les fichiers Python dans un répertoire"""
     if env_vars is None:
@@ -176,16 +167,16 @@ def process_directory(root_dir: str = ".", env_vars: Dict[str, str] = None) -> D
             env_vars = {}
     
     results = {}
-    excluded_dirs = {'__pycache__', '.git', 'venv', 'env', '.venv', 'node_modules'}
     
-    for py_file in Path(root_dir).rglob('*.py'):
-        # Exclure les répertoires spécifiques
-        if any(excluded in str(py_file) for excluded in excluded_dirs):
-            continue
-        
-        replacements = replace_hardcoded_in_file(str(py_file), env_vars)
+    # Parcours et analyse partagés avec find_hardcoded.py : chaque fichier est réécrit
+    # à partir des octets lus par l'analyse, les numéros de ligne portant sur ce même contenu.
+    # Sur les grands arbres, les réécritures (fichiers disjoints) sont réparties sur
+    # plusieurs processus et leur sortie est affichée dans l'ordre du parcours
+    rewrite = partial(_rewrite_scanned, env_vars=env_vars)
+    for file_path, (replacements, output) in map_tree(rewrite, root_dir, EXCLUDED_DIRS):
+        print(output, end='')
         if replacements > 0:
-            results[str(py_file)] = replacements
+            results[file_path] = replacements
     
     return results
 
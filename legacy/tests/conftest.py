@@ -0,0 +1,13 @@
+"""
+Configuration commune des tests : les modules du dossier legacy (et les
+scripts autonomes de legacy/scripts) sont importés comme en production.
+"""
+
+import sys
+from pathlib import Path
+
+LEGACY_DIR = Path(__file__).resolve().parent.parent
+
+for path in (LEGACY_DIR, LEGACY_DIR / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,83 @@
+"""Tests du service IA."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from enthropic.ai_service import AIService, IntentType
+
+
+class _Manager:
+    async def set_device_state(self, device_id, command):
+        return {"status": "success"}
+
+
+class _PlainManager:
+    pass
+
+
+@pytest.fixture
+def service():
+    return AIService()
+
+
+def test_device_manager_support_is_cached_per_type(service):
+    """La présence de set_device_state sur la classe est mémorisée par type."""
+    assert service._supports_set_device_state(_Manager())
+    assert service._device_manager_support == {_Manager: True}
+
+
+def test_device_manager_support_checks_instances_without_method(service):
+    """Sans méthode de classe, chaque instance est vérifiée (réponse négative non mémorisée)."""
+    dynamic = _PlainManager()
+    dynamic.set_device_state = _Manager().set_device_state
+    
+    assert not service._supports_set_device_state(_PlainManager())
+    assert service._supports_set_device_state(dynamic)
+
+
+def test_intent_request_sends_pre_encoded_json():
+    """Le payload part en octets déjà encodés, avec l'en-tête JSON et l'autorisation."""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"intent_type": "control"})
+    
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = AIService(api_key="secret", http_client=client)
+            return await service._call_intent_api("allume la lumière", "alice", "2026-01-01T00:00:00")
+    
+    assert asyncio.run(scenario()) == {"intent_type": "control"}
+    request, = requests
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["Authorization"] == "Bearer secret"
+    assert json.loads(request.content) == {
+        "text": "allume la lumière",
+        "user_id": "alice",
+        "timestamp": "2026-01-01T00:00:00"
+    }
+
+
+@pytest.mark.parametrize("api_type, expected", [
+    ("scene", IntentType.SCENE),
+    ("query", IntentType.QUERY),
+    ("inconnu", IntentType.CONTROL),
+    (None, IntentType.CONTROL),
+])
+def test_analyze_intent_maps_api_types(api_type, expected):
+    """Un type d'API inconnu ou absent devient CONTROL au lieu de passer par le chemin d'erreur."""
+    body = {"confidence": 0.8} if api_type is None else {"type": api_type, "confidence": 0.8}
+    
+    async def scenario():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await AIService(http_client=client).analyze_intent("allume la lumière")
+    
+    intent = asyncio.run(scenario())
+    
+    assert intent.type is expected
+    assert intent.confidence == 0.8
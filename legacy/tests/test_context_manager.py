@@ -0,0 +1,72 @@
+"""Tests du cache de contexte (local et Redis)."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from enthropic.context_manager import ContextManager
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _run(scenario):
+    """Exécute un scénario avec un ContextManager adossé à un Redis en mémoire."""
+    async def main():
+        redis_client = fakeredis.FakeAsyncRedis()
+        async with ContextManager(redis_client=redis_client) as manager:
+            return await scenario(manager, redis_client)
+    return asyncio.run(main())
+
+
+def test_redis_hit_keeps_remaining_ttl_and_stale_ttl():
+    """Une valeur lue dans Redis n'est gardée localement que le temps qu'il lui reste."""
+    async def scenario(manager, redis_client):
+        key = manager._get_cache_key("weather", "alice")
+        await redis_client.set(key, json.dumps({"temperature": 20}), px=2000)
+        
+        found = await manager._bulk_get_cached([key])
+        expires_at, fresh_until, data = manager._local_cache[key]
+        return found, fresh_until - time.monotonic(), expires_at - fresh_until, data
+    
+    found, remaining, stale, data = _run(scenario)
+    
+    assert found == {"context:weather:alice": {"temperature": 20}}
+    assert data == {"temperature": 20}
+    # 2 s restantes dans Redis (et non le cache_ttl de 1800 s de la source)
+    assert 0 < remaining <= 2
+    assert stale == pytest.approx(1800)
+
+
+def test_redis_hit_without_expiry_uses_source_ttl():
+    """Une clé Redis sans expiration reçoit le TTL de sa source."""
+    async def scenario(manager, redis_client):
+        key = manager._get_cache_key("device_states", "alice")
+        await redis_client.set(key, json.dumps({"lamp": {"on": True}}))
+        
+        assert await manager._get_cached_data(key) == {"lamp": {"on": True}}
+        _, fresh_until, _ = manager._local_cache[key]
+        return fresh_until - time.monotonic()
+    
+    remaining = _run(scenario)
+    
+    assert 29 < remaining <= 30
+
+
+def test_update_context_invalidates_device_states_everywhere():
+    """Après une mise à jour des états, ni le cache local ni Redis ne servent les anciens."""
+    async def scenario(manager, redis_client):
+        context = await manager.get_context("alice")
+        key = manager._get_cache_key("device_states", "alice")
+        assert await redis_client.exists(key)
+        
+        updated = await manager.update_context(context, {"device_states": {"lamp": {"on": True}}})
+        
+        return updated, await redis_client.exists(key), await manager._bulk_get_cached([key])
+    
+    updated, in_redis, cached = _run(scenario)
+    
+    assert updated.device_states["lamp"] == {"on": True}
+    assert not in_redis
+    assert cached == {}
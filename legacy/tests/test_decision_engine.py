@@ -0,0 +1,66 @@
+"""Tests du moteur de décision."""
+
+import asyncio
+
+import pytest
+
+from enthropic.ai_service import Context
+from enthropic.decision_engine import DecisionEngine
+from enthropic.intent_parser import IntentParser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return IntentParser()
+
+
+def test_decision_cache_follows_mutated_inputs(parser, monkeypatch):
+    """Une intention modifiée sur place n'obtient pas la décision mémorisée pour son ancien contenu."""
+    engine = DecisionEngine()
+    
+    async def unavailable(*args, **kwargs):
+        raise RuntimeError("API indisponible")
+    
+    monkeypatch.setattr(engine, "_call_decision_api", unavailable)
+    intent, context = parser.parse("allume la lampe"), Context()
+    
+    first = asyncio.run(engine.make_decision(intent, context, []))
+    assert asyncio.run(engine.make_decision(intent, context, [])) is first
+    
+    updated = parser.parse("quelle température")
+    intent.type, intent.text, intent.entities = updated.type, updated.text, updated.entities
+    
+    assert first.action == "turn_on"
+    assert asyncio.run(engine.make_decision(intent, context, [])).action == "query_status"
+
+
+def test_http_client_is_shared_per_event_loop():
+    """Un client par boucle : un nouvel asyncio.run() n'hérite pas d'un pool lié à une boucle fermée."""
+    async def clients():
+        first, second = DecisionEngine(), DecisionEngine()
+        return first.http_client, second.http_client
+    
+    first_loop_clients = asyncio.run(clients())
+    second_loop_clients = asyncio.run(clients())
+    
+    assert first_loop_clients[0] is first_loop_clients[1]
+    assert second_loop_clients[0] is second_loop_clients[1]
+    assert second_loop_clients[0] is not first_loop_clients[0]
+    # Le client de la première boucle, fermée, a été abandonné
+    assert first_loop_clients[0] not in DecisionEngine._shared_clients.values()
+
+
+def test_aclose_shared_client_closes_current_loop_client():
+    """La fermeture libère le client de la boucle courante ; il est recréé au besoin."""
+    async def close_and_reopen():
+        engine = DecisionEngine()
+        client = engine.http_client
+        await DecisionEngine.aclose_shared_client()
+        reopened = engine.http_client
+        await DecisionEngine.aclose_shared_client()
+        return client, reopened
+    
+    client, reopened = asyncio.run(close_and_reopen())
+    
+    assert client.is_closed and reopened.is_closed
+    assert reopened is not client
@@ -0,0 +1,23 @@
+"""Tests des entités et de leurs capacités."""
+
+from entities.models import Device
+from entities.mqtt_entities import MQTTDeviceEntity
+
+
+def _device(**capabilities) -> Device:
+    return Device(id="d1", protocol="mqtt", name="Prise", type="switch", capabilities=capabilities)
+
+
+def test_mqtt_device_capabilities_follow_device_changes():
+    """Les capacités suivent les modifications du device et son remplacement."""
+    entity = MQTTDeviceEntity("switch.prise", "Prise", "home/prise", _device(a=True))
+    assert entity.get_capabilities() == ("publish", "subscribe", "a")
+    
+    entity.device.capabilities["b"] = True
+    assert entity.get_capabilities() == ("publish", "subscribe", "a", "b")
+    
+    entity.device = _device(c=True)
+    assert entity.get_capabilities() == ("publish", "subscribe", "c")
+    
+    entity.device = None
+    assert entity.get_capabilities() == ("publish", "subscribe")
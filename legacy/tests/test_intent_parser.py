@@ -0,0 +1,29 @@
+"""Tests de l'analyseur d'intentions local."""
+
+import pytest
+
+from enthropic.intent_parser import IntentParser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return IntentParser()
+
+
+def test_enrich_intent_without_context_keys_returns_same_intent(parser):
+    """Sans information de contexte à fusionner, l'intention est rendue sans copie."""
+    intent = parser.parse("allume la lampe")
+    
+    assert parser.enrich_intent(intent, {"unrelated": 1}) is intent
+
+
+def test_enrich_intent_copies_instead_of_mutating(parser):
+    """Avec du contexte, une nouvelle intention est créée et l'originale reste intacte."""
+    intent = parser.parse("allume la lampe")
+    entities = dict(intent.entities)
+    
+    enriched = parser.enrich_intent(intent, {"user_id": "alice", "location": "salon"})
+    
+    assert enriched is not intent
+    assert enriched.entities == {**entities, "user": "alice", "location": "salon"}
+    assert intent.entities == entities
@@ -0,0 +1,39 @@
+"""Tests des modèles de données des entités."""
+
+from entities.device_entities import SensorEntity
+from entities.models import BaseEntity, Device, Service
+
+
+def test_service_is_hashable_despite_data_dict():
+    """Service gelé reste utilisable comme clé malgré son dictionnaire de données."""
+    service = Service("light", "turn_on", {"brightness": 255})
+    
+    assert {service: True}[Service("light", "turn_on", {"brightness": 255})]
+    assert service != Service("light", "turn_on", {"brightness": 128})
+
+
+def test_update_state_mutates_existing_state_in_place():
+    """La première mise à jour crée l'état, les suivantes le modifient sur place."""
+    entity = SensorEntity("sensor.temp", "Température")
+    entity.update_state(20.5, {"unit": "°C"})
+    state = entity.state
+    first_timestamp = state.timestamp
+    
+    entity.update_state(21.0)
+    
+    assert entity.state is state
+    assert (state.value, state.attributes) == (21.0, {})
+    assert state.timestamp >= first_timestamp
+
+
+def test_base_entity_capabilities_default_to_device_tuple():
+    """L'implémentation par défaut rend un tuple, comme les surcharges ; le mémo démarre vide."""
+    class PlainEntity(BaseEntity):
+        __slots__ = ()
+    
+    entity = PlainEntity("generic.x", "X")
+    assert entity._capabilities is None
+    assert entity.get_capabilities() == ()
+    
+    entity.device = Device(id="d1", protocol="mqtt", name="X", type="switch", capabilities={"on_off": True})
+    assert entity.get_capabilities() == ("on_off",)
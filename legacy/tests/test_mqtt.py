@@ -0,0 +1,88 @@
+"""Tests du client MQTT."""
+
+import asyncio
+from types import SimpleNamespace
+
+import aiomqtt
+
+import protocols.mqtt
+from protocols.mqtt import MQTTClient, MQTTMessage
+
+
+def _listening_client(*payloads: bytes) -> MQTTClient:
+    """Client connecté dont le flux de messages rejoue les payloads donnés."""
+    async def messages():
+        for mid, payload in enumerate(payloads):
+            yield aiomqtt.Message("home/test", payload, qos=0, retain=False, mid=mid, properties=None)
+    
+    client = MQTTClient()
+    client._connected = True
+    client._client = SimpleNamespace(messages=messages())
+    return client
+
+
+def test_listen_awaits_coroutine_returned_by_plain_callable():
+    """Un callable ordinaire renvoyant une coroutine (lambda) voit sa coroutine attendue."""
+    received = []
+    
+    async def handle(message):
+        received.append(message.payload)
+    
+    asyncio.run(_listening_client(b'{"on": true}', b"texte").listen(lambda message: handle(message)))
+    
+    assert received == [{"on": True}, "texte"]
+
+
+def test_listen_calls_sync_callback():
+    """Un callback synchrone est appelé pour chaque message."""
+    received = []
+    
+    asyncio.run(_listening_client(b"1", b"2").listen(lambda message: received.append(message.payload)))
+    
+    assert received == [1, 2]
+
+
+def test_message_payload_is_decoded_lazily(monkeypatch):
+    """Le payload n'est décodé qu'au premier accès, puis mémorisé ; raw reste intact."""
+    calls = []
+    decode = protocols.mqtt._decode_payload
+    
+    def counting_decode(raw):
+        calls.append(raw)
+        return decode(raw)
+    
+    monkeypatch.setattr(protocols.mqtt, "_decode_payload", counting_decode)
+    message = MQTTMessage.from_aiomqtt(
+        aiomqtt.Message("home/test", b'{"on": true}', qos=1, retain=False, mid=7, properties=None)
+    )
+    
+    assert calls == []
+    assert message.payload == {"on": True}
+    assert message.payload == {"on": True}
+    assert calls == [b'{"on": true}']
+    assert message.raw == b'{"on": true}'
+    assert message.to_dict()["payload"] == {"on": True}
+
+
+def test_message_payload_can_be_assigned():
+    """Un payload fourni ou affecté n'est jamais redécodé depuis les octets."""
+    message = MQTTMessage("home/test", {"on": False})
+    message.payload = "remplacé"
+    
+    assert message.payload == "remplacé"
+    assert message.raw is None
+
+
+def test_publish_sends_raw_bytes_unchanged():
+    """Les octets (ex. message.raw) sont republiés tels quels, sans réencodage."""
+    published = []
+    
+    async def publish(topic, payload, qos, retain):
+        published.append((topic, payload))
+    
+    client = MQTTClient()
+    client._connected = True
+    client._client = SimpleNamespace(publish=publish)
+    
+    assert asyncio.run(client.publish("home/out", bytearray(b"\x00\xff")))
+    assert published == [("home/out", b"\x00\xff")]
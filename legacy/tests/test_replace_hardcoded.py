@@ -0,0 +1,138 @@
+"""Tests du remplacement des valeurs hardcodées par os.getenv()."""
+
+import ast
+from pathlib import Path
+
+import _scanner
+from replace_hardcoded import process_directory, replace_hardcoded_in_file
+
+
+def _getenv_defaults(source: str) -> dict:
+    """Valeurs par défaut des appels os.getenv("NOM", défaut) d'un module."""
+    defaults = {}
+    for node in ast.walk(ast.parse(source)):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "getenv"):
+            defaults[node.args[0].value] = ast.literal_eval(node.args[1])
+    return defaults
+
+
+def test_rewrite_preserves_escaped_literals(tmp_path, monkeypatch):
+    """Les littéraux avec échappements restent valides et gardent leur valeur."""
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "settings.py"
+    module.write_text(
+        'SEPARATOR_CHAR = "a\\nb"\n'
+        'LOG_FORMAT = "%(name)s\\t%(msg)s"\n'
+        'WIN_PATH = "C:\\\\temp"\n'
+        "QUOTED_TEXT = 'il dit \"oui\"'\n"
+        'APP_NAME = "gateway"\n',
+        encoding="utf-8"
+    )
+    
+    results = process_directory(str(tmp_path), {})
+    
+    assert results == {str(module): 5}
+    rewritten = module.read_text(encoding="utf-8")
+    assert _getenv_defaults(rewritten) == {
+        "SEPARATOR_CHAR": "a\nb",
+        "LOG_FORMAT": "%(name)s\t%(msg)s",
+        "WIN_PATH": "C:\\temp",
+        "QUOTED_TEXT": 'il dit "oui"',
+        "APP_NAME": "gateway",
+    }
+    # Les chaînes simples restent entre guillemets doubles
+    assert 'APP_NAME = os.getenv("APP_NAME", "gateway")' in rewritten
+    assert rewritten.startswith("import os\n")
+
+
+def test_rewrite_quotes_env_values(tmp_path, monkeypatch):
+    """Les valeurs issues du .env sont écrites sous forme de littéraux valides."""
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "config.py"
+    module.write_text('import os\nAPI_HOST = "10.0.0.1"\nMQTT_PORT = 1884\n', encoding="utf-8")
+    
+    process_directory(str(tmp_path), {"API_HOST": 'host"name', "MQTT_PORT": "1883"})
+    
+    rewritten = module.read_text(encoding="utf-8")
+    assert _getenv_defaults(rewritten) == {"API_HOST": 'host"name', "MQTT_PORT": 1883}
+
+
+def test_rewrite_keeps_indentation_and_skips_invalid_files(tmp_path, monkeypatch, capsys):
+    """Seules les affectations sur une ligne sont réécrites ; un fichier invalide est ignoré."""
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "nested.py"
+    module.write_text(
+        'import sys\n'
+        'class Config:\n'
+        '    DB_HOST = "db.local"  \n'
+        'MULTI_LINE = (\n'
+        '    "a"\n'
+        ')\n',
+        encoding="utf-8"
+    )
+    (tmp_path / "broken.py").write_text("BROKEN_VALUE = (\n", encoding="utf-8")
+    
+    results = process_directory(str(tmp_path), {})
+    
+    assert results == {str(module): 1}
+    rewritten = module.read_text(encoding="utf-8")
+    ast.parse(rewritten)
+    assert '    DB_HOST = os.getenv("DB_HOST", "db.local")  \n' in rewritten
+    assert 'MULTI_LINE = (\n    "a"\n)\n' in rewritten
+    assert "broken.py" in capsys.readouterr().out
+    assert (tmp_path / "broken.py").read_text(encoding="utf-8") == "BROKEN_VALUE = (\n"
+
+
+def test_rewrite_targets_lines_by_number(tmp_path):
+    """Une ligne contenue dans une autre (RETRY_X = 5 dans MAX_RETRY_X = 50) n'altère que la sienne."""
+    module = tmp_path / "limits.py"
+    module.write_text("import os\nMAX_RETRY_X = 50\nRETRY_X = 5\n", encoding="utf-8")
+    
+    assert replace_hardcoded_in_file(str(module), {}) == 2
+    
+    rewritten = module.read_text(encoding="utf-8")
+    assert rewritten.splitlines()[1:] == [
+        'MAX_RETRY_X = os.getenv("MAX_RETRY_X", "50")',
+        'RETRY_X = os.getenv("RETRY_X", "5")',
+    ]
+
+
+def test_rewrite_reads_each_file_once(tmp_path, monkeypatch):
+    """Le contenu lu par l'analyse sert à la réécriture : aucun fichier n'est relu."""
+    (tmp_path / "a.py").write_text('API_HOST = "a.local"\n', encoding="utf-8")
+    (tmp_path / "b.py").write_text("x = 1\n", encoding="utf-8")
+    reads = []
+    read_bytes = Path.read_bytes
+    
+    def counting_read_bytes(path):
+        reads.append(path.name)
+        return read_bytes(path)
+    
+    monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+    
+    assert process_directory(str(tmp_path), {}) == {str(tmp_path / "a.py"): 1}
+    assert sorted(reads) == ["a.py", "b.py"]
+
+
+def test_parallel_rewrite_matches_serial(tmp_path, monkeypatch, capsys):
+    """Réécritures réparties sur plusieurs processus : mêmes fichiers, sortie dans l'ordre du parcours."""
+    def write_tree(root):
+        root.mkdir()
+        for index in range(4):
+            (root / f"module_{index}.py").write_text(f'API_HOST = "host-{index}"\nx = 1\n', encoding="utf-8")
+    
+    write_tree(tmp_path / "serial")
+    serial = process_directory(str(tmp_path / "serial"), {})
+    serial_output = capsys.readouterr().out
+    
+    monkeypatch.setattr(_scanner, "_PARALLEL_MIN_FILES", 1)
+    write_tree(tmp_path / "parallel")
+    parallel = process_directory(str(tmp_path / "parallel"), {})
+    
+    assert len(parallel) == 4
+    assert list(parallel.values()) == list(serial.values())
+    assert capsys.readouterr().out == serial_output.replace("serial", "parallel")
+    for index in range(4):
+        rewritten = (tmp_path / "parallel" / f"module_{index}.py").read_text(encoding="utf-8")
+        assert _getenv_defaults(rewritten) == {"API_HOST": f"host-{index}"}
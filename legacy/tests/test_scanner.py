@@ -0,0 +1,33 @@
+"""Tests du parcours partagé des scripts de détection."""
+
+import _scanner
+from _scanner import scan_tree
+
+
+def _write_tree(root, count):
+    """Arborescence de modules, un sur deux contenant une valeur hardcodée."""
+    for index in range(count):
+        body = f'API_HOST = "host-{index}"\r\n' if index % 2 else "x = 1\n"
+        (root / f"module_{index}.py").write_bytes(body.encode())
+    (root / "broken.py").write_text("API_HOST = (\n")
+
+
+def test_parallel_scan_returns_only_flagged_lines(tmp_path, monkeypatch, capsys):
+    """Les processus ne renvoient que les lignes retenues, comme le parcours séquentiel."""
+    _write_tree(tmp_path, 6)
+    serial = sorted(scan_tree(str(tmp_path)))
+    
+    monkeypatch.setattr(_scanner, "_PARALLEL_MIN_FILES", 1)
+    parallel = sorted(scan_tree(str(tmp_path)))
+    
+    assert parallel == serial
+    assert len(parallel) == 6
+    for path, findings, lines in parallel:
+        index = int(path.rsplit("_", 1)[1][:-3])
+        if index % 2:
+            assert findings == [(1, "API_HOST", f"host-{index}", "string")]
+            assert lines == [f'API_HOST = "host-{index}"\r'.encode()]
+        else:
+            assert findings == lines == []
+    # Fichier invalide signalé une fois par parcours
+    assert capsys.readouterr().out.count("Erreur lors de la lecture") == 2